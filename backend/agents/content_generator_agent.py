@@ -61,7 +61,8 @@ class ContentGeneratorAgent:
             self.model = None
     
     async def generate_content(self, topic: str, difficulty_level: str, content_type: str, 
-                             subject: str = "General", learning_objectives: Optional[list] = None) -> Dict[str, Any]:
+                             subject: str = "General", learning_objectives: Optional[list] = None,
+                             deadline: Optional[float] = None) -> Dict[str, Any]:
         """
         Generate educational content using Gemini AI
         
@@ -71,6 +72,9 @@ class ContentGeneratorAgent:
             content_type (str): Type of content to generate
             subject (str): Subject area (optional)
             learning_objectives (list): Specific learning goals (optional)
+            deadline (float): Event loop time by which generation must finish (optional).
+                Stages still running at the deadline are dropped and the result is
+                flagged partial; only a missing main content is an error.
             
         Returns:
             dict: Generated educational content with metadata
@@ -81,20 +85,40 @@ class ContentGeneratorAgent:
             
             logger.info(f"🔄 Generating content for topic: {topic}, difficulty: {difficulty_level}, type: {content_type}")
             
-            # Generate the main content
-            main_content = await self._generate_main_content(topic, difficulty_level, content_type, subject, learning_objectives)
+            # Generate the main content; without it there is nothing to return
+            try:
+                main_content = await asyncio.wait_for(
+                    self._generate_main_content(topic, difficulty_level, content_type, subject, learning_objectives, deadline),
+                    timeout=self._remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                raise Exception("Deadline exceeded before main content was generated")
+            
+            # Study materials and key concepts only depend on the main content, so run them side by side
+            stages = {
+                'study_materials': asyncio.create_task(self._create_study_materials(topic, main_content, content_type, deadline)),
+                'key_concepts': asyncio.create_task(self._extract_key_concepts(topic, main_content, deadline))
+            }
+            try:
+                done, _ = await asyncio.wait(stages.values(), timeout=self._remaining(deadline))
+            finally:
+                for task in stages.values():
+                    if not task.done():
+                        task.cancel()
             
-            # Create study materials
-            study_materials = await self._create_study_materials(topic, main_content, content_type)
+            missing_stages = [name for name, task in stages.items() if task not in done]
+            if missing_stages:
+                logger.warning(f"⏰ Deadline reached for topic {topic}; returning without: {', '.join(missing_stages)}")
             
-            # Generate key concepts and summary
-            key_concepts = await self._extract_key_concepts(topic, main_content)
+            study_materials = None if 'study_materials' in missing_stages else stages['study_materials'].result()
+            key_concepts = [] if 'key_concepts' in missing_stages else stages['key_concepts'].result()
             
             # Create comprehensive response
             result = {
                 'content': main_content,
                 'study_materials': study_materials,
                 'key_concepts': key_concepts,
+                'partial': bool(missing_stages),
                 'metadata': {
                     'topic': topic,
                     'difficulty_level': difficulty_level,
@@ -102,7 +126,8 @@ class ContentGeneratorAgent:
                     'subject': subject,
                     'generated_at': datetime.utcnow().isoformat(),
                     'model_used': 'gemini-2.0-flash-exp' if '2.0' in str(self.model) else 'gemini-1.5-pro',
-                    'agent_id': self.agent_id
+                    'agent_id': self.agent_id,
+                    'missing_stages': missing_stages
                 }
             }
             
@@ -113,8 +138,22 @@ class ContentGeneratorAgent:
             logger.error(f"❌ Content generation failed for topic {topic}: {str(e)}")
             raise Exception(f"Content generation failed: {str(e)}")
     
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds left until the deadline, or None when there is no deadline"""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - asyncio.get_running_loop().time())
+    
+    def _request_options(self, deadline: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Propagate the remaining deadline to the upstream Gemini request"""
+        remaining = self._remaining(deadline)
+        if remaining is None:
+            return None
+        return {'timeout': max(remaining, 1.0)}
+    
     async def _generate_main_content(self, topic: str, difficulty_level: str, content_type: str, 
-                                   subject: str, learning_objectives: Optional[list]) -> str:
+                                   subject: str, learning_objectives: Optional[list],
+                                   deadline: Optional[float] = None) -> str:
         """Generate the main educational content"""
         
         # Map content types to specific generation styles
@@ -161,10 +200,10 @@ class ContentGeneratorAgent:
         """
         
         try:
-            # Generate content using Gemini AI
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                f"{system_prompt}\n\n{user_prompt}"
+            # Generate content using Gemini AI (native async so cancellation aborts the call)
+            response = await self.model.generate_content_async(
+                f"{system_prompt}\n\n{user_prompt}",
+                request_options=self._request_options(deadline)
             )
             
             if response and response.text:
@@ -176,7 +215,8 @@ class ContentGeneratorAgent:
             logger.error(f"Error generating content with Gemini: {e}")
             raise Exception(f"Content generation with Gemini failed: {str(e)}")
     
-    async def _create_study_materials(self, topic: str, content: str, content_type: str) -> Dict[str, Any]:
+    async def _create_study_materials(self, topic: str, content: str, content_type: str,
+                                      deadline: Optional[float] = None) -> Dict[str, Any]:
         """Create additional study materials based on the generated content"""
         
         try:
@@ -193,9 +233,9 @@ Create:
 
 Format as a structured study guide."""
             
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                f"You are an expert educational content creator. {study_prompt}"
+            response = await self.model.generate_content_async(
+                f"You are an expert educational content creator. {study_prompt}",
+                request_options=self._request_options(deadline)
             )
             
             if response and response.text:
@@ -217,7 +257,7 @@ Format as a structured study guide."""
                 'topic': topic
             }
     
-    async def _extract_key_concepts(self, topic: str, content: str) -> list:
+    async def _extract_key_concepts(self, topic: str, content: str, deadline: Optional[float] = None) -> list:
         """Extract key concepts from the generated content"""
         
         try:
@@ -228,9 +268,9 @@ Format as a structured study guide."""
 
 List only the key concept names, one per line, without explanations."""
             
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                f"You are an expert at identifying key concepts in educational content. {concepts_prompt}"
+            response = await self.model.generate_content_async(
+                f"You are an expert at identifying key concepts in educational content. {concepts_prompt}",
+                request_options=self._request_options(deadline)
             )
             
             if response and response.text:
@@ -262,8 +302,7 @@ Adjust:
 
 Make it appropriate for {target_difficulty} learners while maintaining accuracy."""
             
-            response = await asyncio.to_thread(
-                self.model.generate_content,
+            response = await self.model.generate_content_async(
                 f"You are an expert at adapting educational content for different skill levels. {adaptation_prompt}"
             )
             
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict
 import os
 from dotenv import load_dotenv
 
@@ -9,17 +9,81 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     mongodb_uri: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
     mongodb_db_name: str = os.getenv("MONGODB_DB_NAME", "tutormind")
+    mongodb_max_pool_size: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "10"))
+    mongodb_min_pool_size: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "1"))
+    mongodb_wait_queue_timeout_ms: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))  # Max wait for a free connection
+    mongodb_server_selection_timeout_ms: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    mongodb_connect_timeout_ms: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "10000"))
+    mongodb_socket_timeout_ms: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
+    mongodb_compressors: str = os.getenv("MONGODB_COMPRESSORS", "")  # Wire compression, e.g. "zstd,snappy,zlib"
+    mongodb_read_concern: str = os.getenv("MONGODB_READ_CONCERN", "")  # e.g. "local", "majority"; empty = server default
+    mongodb_write_concern: str = os.getenv("MONGODB_WRITE_CONCERN", "")  # e.g. "1", "majority"; empty = server default
+    mongodb_max_staleness_seconds: int = int(os.getenv("MONGODB_MAX_STALENESS_SECONDS", "90"))  # For secondary reads; min 90, -1 = no limit
+    mongodb_slow_command_ms: float = float(os.getenv("MONGODB_SLOW_COMMAND_MS", "100"))  # Log commands at least this slow, with filter shape (0 = off)
+    mongodb_read_routes: Dict[str, str] = {}  # JSON operation -> read preference, overrides DEFAULT_READ_ROUTES
     
     # JWT Configuration
     jwt_secret_key: str = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-change-in-production")
     jwt_algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
     jwt_expires_minutes: int = int(os.getenv("JWT_EXPIRES_MINUTES", "1440"))  # 24 hours
+    jwt_cache_max_size: int = int(os.getenv("JWT_CACHE_MAX_SIZE", "10000"))  # Verified tokens kept decoded (0 = off)
+    jwt_cache_ttl_seconds: float = float(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))
+    jwt_cache_expiry_margin_seconds: float = float(os.getenv("JWT_CACHE_EXPIRY_MARGIN_SECONDS", "5"))  # Evict this long before exp
+    
+    # Password Hashing Configuration
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Existing hashes with another cost are rehashed on login
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))  # bcrypt operations run at once
+    password_hash_max_queue: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))  # Waiting operations before new ones get 503
+    
+    # Login Throttling Configuration (a limit of 0 disables it)
+    login_throttle_backend: str = os.getenv("LOGIN_THROTTLE_BACKEND", "memory")  # "memory" (per node) or "mongo" (shared)
+    login_max_attempts_per_ip: int = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "30"))
+    login_ip_window_seconds: float = float(os.getenv("LOGIN_IP_WINDOW_SECONDS", "60"))
+    login_max_attempts_per_email: int = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_EMAIL", "10"))
+    login_email_window_seconds: float = float(os.getenv("LOGIN_EMAIL_WINDOW_SECONDS", "300"))
     
     # Server Configuration
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "True").lower() == "true"
     
+    # Content Generation Configuration
+    content_wait_max_timeout: float = float(os.getenv("CONTENT_WAIT_MAX_TIMEOUT", "60"))  # Long-poll cap in seconds
+    max_concurrent_generations: int = int(os.getenv("MAX_CONCURRENT_GENERATIONS", "4"))
+    # Generated text at least this many bytes is compressed at rest (0 disables)
+    content_compression_threshold: int = int(os.getenv("CONTENT_COMPRESSION_THRESHOLD", "4096"))
+    content_compression_codec: str = os.getenv("CONTENT_COMPRESSION_CODEC", "zlib")  # zlib or zstd
+    history_max_page_size: int = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "100"))
+    fast_serialization: bool = os.getenv("FAST_SERIALIZATION", "True").lower() == "true"  # Skip re-validation of DB-sourced responses
+    # HTTP response compression, negotiated per request (br needs the brotli package)
+    response_compression: bool = os.getenv("RESPONSE_COMPRESSION", "True").lower() == "true"
+    response_compression_min_size: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))  # Smaller bodies are sent as is
+    response_gzip_level: int = int(os.getenv("RESPONSE_GZIP_LEVEL", "4"))
+    response_brotli_quality: int = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+    archive_after_days: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))  # Move finished content older than this to content_archive (0 = off)
+    archive_batch_size: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    archive_interval_hours: float = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24"))  # 0 = only on admin request
+    stats_reconcile_interval_hours: float = float(os.getenv("STATS_RECONCILE_INTERVAL_HOURS", "0"))  # Rebuild user_stats periodically (0 = only on admin request)
+    search_backend: str = os.getenv("SEARCH_BACKEND", "mongo")  # "mongo" (text index) or "memory" (in-process inverted index)
+    search_body_max_chars: int = int(os.getenv("SEARCH_BODY_MAX_CHARS", "20000"))  # Body text kept per content_search document
+    search_memory_max_users: int = int(os.getenv("SEARCH_MEMORY_MAX_USERS", "200"))  # Per-user in-memory indexes kept loaded
+    search_memory_ttl_seconds: float = float(os.getenv("SEARCH_MEMORY_TTL_SECONDS", "60"))  # Rebuild a loaded index after this long (other workers' writes)
+    generation_deadline_seconds: float = float(os.getenv("GENERATION_DEADLINE_SECONDS", "300"))
+    # Per content_type overrides as JSON, e.g. GENERATION_DEADLINES={"tutorial": 600}
+    generation_deadlines: Dict[str, float] = {}
+    
+    # User cache: authenticated users kept in process so auth is not a DB read per request
+    user_cache_max_size: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+    user_cache_ttl_seconds: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))  # 0 = off
+    user_cache_change_stream: bool = os.getenv("USER_CACHE_CHANGE_STREAM", "False").lower() == "true"  # Invalidate on changes from any node
+    
+    # Claims-only auth: how often the revocation/deactivation list is reloaded
+    auth_revocation_refresh_seconds: float = float(os.getenv("AUTH_REVOCATION_REFRESH_SECONDS", "30"))
+    
+    # Admin Configuration
+    # Emails allowed to call /admin endpoints, as JSON, e.g. ADMIN_EMAILS=["ops@example.com"]
+    admin_emails: list = []
+    
     # CORS Configuration
     cors_origins: list = [
         "http://localhost:3000",
@@ -30,6 +94,10 @@ class Settings(BaseSettings):
         "http://127.0.0.1:5174"
     ]
     
+    def get_generation_deadline(self, content_type: str) -> float:
+        """Get the overall generation deadline in seconds for a content type."""
+        return self.generation_deadlines.get(content_type, self.generation_deadline_seconds)
+    
     class Config:
         env_file = ".env"
         extra = "ignore"  # Allow extra fields from environment
@@ -0,0 +1,69 @@
+from fastapi import FastAPI, Request
+from app.services.user_service import UserService
+from app.services.content_service import ContentService
+from app.services.artifact_service import ArtifactService
+from app.services.agent_service import AgentService
+from app.services.archive_service import ArchiveService
+from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
+from app.services.revocation_service import RevocationService
+from app.services.login_throttle import LoginThrottle
+import logging
+
+logger = logging.getLogger(__name__)
+
+def init_services(app: FastAPI) -> None:
+    """
+    Create the app-scoped service instances once the database is connected.
+
+    Routes receive these through the get_* dependencies below, so caches,
+    pools and instrumentation attached to a service are shared by every
+    request. Tests can swap in doubles with app.dependency_overrides.
+    """
+    revocation_service = RevocationService()
+    stats_service = StatsService()
+    content_service = ContentService(stats_service=stats_service)
+    artifact_service = ArtifactService()
+    search_service = SearchService(artifact_service=artifact_service)
+
+    app.state.revocation_service = revocation_service
+    app.state.user_service = UserService(revocation_service=revocation_service)
+    app.state.login_throttle = LoginThrottle()
+    app.state.content_service = content_service
+    app.state.artifact_service = artifact_service
+    app.state.search_service = search_service
+    app.state.agent_service = AgentService(
+        content_service=content_service,
+        artifact_service=artifact_service,
+        search_service=search_service
+    )
+    app.state.archive_service = ArchiveService()
+    app.state.stats_service = stats_service
+    logger.info("🧩 App-scoped services initialized")
+
+def get_user_service(request: Request) -> UserService:
+    return request.app.state.user_service
+
+def get_revocation_service(request: Request) -> RevocationService:
+    return request.app.state.revocation_service
+
+def get_login_throttle(request: Request) -> LoginThrottle:
+    return request.app.state.login_throttle
+
+def get_content_service(request: Request) -> ContentService:
+    return request.app.state.content_service
+
+def get_artifact_service(request: Request) -> ArtifactService:
+    return request.app.state.artifact_service
+
+def get_agent_service(request: Request) -> AgentService:
+    return request.app.state.agent_service
+
+def get_archive_service(request: Request) -> ArchiveService:
+    return request.app.state.archive_service
+
+def get_search_service(request: Request) -> SearchService:
+    return request.app.state.search_service
+
+def get_stats_service(request: Request) -> StatsService:
+    return request.app.state.stats_service
@@ -4,7 +4,13 @@ from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.config import settings
 from app.utils.database import connect_to_mongo, close_mongo_connection
-from app.routes import auth, content
+from app.utils.indexes import ensure_indexes
+from app.dependencies import init_services
+from app.routes import auth, content, admin
+from app.services.job_manager import job_manager
+from app.utils.security import password_hasher
+from app.utils.serialization import FastJSONResponse
+from app.utils.response_compression import CompressionMiddleware
 import logging
 
 # Set up logging
@@ -16,12 +22,25 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting TutorMind AI Backend...")
     await connect_to_mongo()
+    await ensure_indexes()
+    init_services(app)
+    app.state.archive_service.start()
+    app.state.stats_service.start()
+    app.state.user_service.start()
+    await app.state.revocation_service.refresh()
+    app.state.revocation_service.start()
     logger.info("✅ Backend startup complete!")
     
     yield
     
     # Shutdown
     logger.info("🔄 Shutting down TutorMind AI Backend...")
+    await app.state.archive_service.stop()
+    await app.state.stats_service.stop()
+    await app.state.user_service.stop()
+    await app.state.revocation_service.stop()
+    await job_manager.shutdown()
+    password_hasher.shutdown()
     await close_mongo_connection()
     logger.info("✅ Backend shutdown complete!")
 
@@ -29,7 +48,8 @@ app = FastAPI(
     title="TutorMind AI Backend",
     description="Multi-agent AI tutoring system backend API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -41,9 +61,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (outermost, so it sees the final body)
+if settings.response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.response_compression_min_size,
+        gzip_level=settings.response_gzip_level,
+        brotli_quality=settings.response_brotli_quality,
+    )
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(content.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
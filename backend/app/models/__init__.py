@@ -1,7 +1,7 @@
-from .user import UserBase, UserCreate, UserLogin, UserResponse, UserInDB, Token, TokenData
-from .content import ContentRequest, ContentGeneration, ContentGenerationResponse, ContentGenerationCreate, ContentGenerationUpdate
+from .user import UserBase, UserCreate, UserLogin, UserResponse, Principal, UserInDB, Token, TokenData
+from .content import ContentRequest, ContentGeneration, ContentGenerationResponse, ContentSummary, ContentHistoryPage, ContentSearchResult, ContentSearchPage, UserContentStats, ContentArtifact, ContentGenerationCreate, ContentGenerationUpdate
 
 __all__ = [
-    "UserBase", "UserCreate", "UserLogin", "UserResponse", "UserInDB", "Token", "TokenData",
-    "ContentRequest", "ContentGeneration", "ContentGenerationResponse", "ContentGenerationCreate", "ContentGenerationUpdate"
+    "UserBase", "UserCreate", "UserLogin", "UserResponse", "Principal", "UserInDB", "Token", "TokenData",
+    "ContentRequest", "ContentGeneration", "ContentGenerationResponse", "ContentSummary", "ContentHistoryPage", "ContentSearchResult", "ContentSearchPage", "UserContentStats", "ContentArtifact", "ContentGenerationCreate", "ContentGenerationUpdate"
 ]
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Any
+from typing import Optional, Any, List, Dict
 from datetime import datetime
 from bson import ObjectId
+from app.utils.serialization import construct_trusted
 
 class PyObjectId(ObjectId):
     @classmethod
@@ -34,11 +35,12 @@ class ContentGeneration(BaseModel):
     topic: str = Field(..., min_length=1, max_length=200)
     difficulty_level: str = Field(..., pattern="^(beginner|intermediate|advanced)$")
     content_type: str = Field(..., min_length=1, max_length=50)
-    status: str = Field(default="pending", pattern="^(pending|processing|completed|failed)$")
+    status: str = Field(default="pending", pattern="^(pending|processing|completed|failed|cancelled)$")
     generated_content: Optional[str] = None
     request_timestamp: datetime = Field(default_factory=datetime.utcnow)
     completion_timestamp: Optional[datetime] = None
     error_message: Optional[str] = None
+    partial: bool = False
     metadata: Optional[dict] = {}
 
     model_config = ConfigDict(
@@ -59,11 +61,15 @@ class ContentGenerationResponse(BaseModel):
     request_timestamp: datetime
     completion_timestamp: Optional[datetime] = None
     error_message: Optional[str] = None
+    partial: bool = False
     metadata: Optional[dict] = {}
 
     @classmethod
-    def from_mongo(cls, data: dict):
-        """Create a ContentGenerationResponse from MongoDB document"""
+    def from_mongo(cls, data: dict, trusted: bool = False):
+        """Create a ContentGenerationResponse from MongoDB document
+        
+        trusted=True skips validation; only pass it for documents read from our own collection.
+        """
         if not data:
             return None
         
@@ -72,6 +78,8 @@ class ContentGenerationResponse(BaseModel):
             if isinstance(data["_id"], ObjectId):
                 data["_id"] = str(data["_id"])
         
+        if trusted:
+            return construct_trusted(cls, data)
         return cls(**data)
 
     model_config = ConfigDict(
@@ -80,6 +88,87 @@ class ContentGenerationResponse(BaseModel):
         json_encoders={ObjectId: str}
     )
 
+class ContentSummary(BaseModel):
+    """Slim response model for content history listings (no content bodies)"""
+    id: str = Field(alias="_id")
+    topic: str
+    difficulty_level: str
+    content_type: str
+    status: str
+    request_timestamp: datetime
+    completion_timestamp: Optional[datetime] = None
+    content_length: int = 0
+
+    @classmethod
+    def from_mongo(cls, data: dict, trusted: bool = False):
+        """Create a ContentSummary from a projected MongoDB document
+        
+        trusted=True skips validation; only pass it for documents read from our own collection.
+        """
+        if not data:
+            return None
+        
+        if "_id" in data:
+            if isinstance(data["_id"], ObjectId):
+                data["_id"] = str(data["_id"])
+        
+        if trusted:
+            return construct_trusted(cls, data)
+        return cls(**data)
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str}
+    )
+
+class ContentHistoryPage(BaseModel):
+    """One page of content history; pass next_cursor back to get the next page"""
+    items: List[ContentSummary]
+    next_cursor: Optional[str] = None
+
+class ContentSearchResult(BaseModel):
+    """One search hit: list fields, relevance score and a snippet of the matching text"""
+    id: str = Field(alias="_id")
+    topic: str
+    content_type: str
+    difficulty_level: str
+    request_timestamp: datetime
+    score: float
+    snippet: str = ""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class ContentSearchPage(BaseModel):
+    """One page of search results; pass next_offset back as offset to get the next page"""
+    items: List[ContentSearchResult]
+    next_offset: Optional[int] = None
+
+class UserContentStats(BaseModel):
+    """A user's content counts by status, content type and difficulty"""
+    total: int = 0
+    by_status: Dict[str, int] = {}
+    by_content_type: Dict[str, int] = {}
+    by_difficulty: Dict[str, int] = {}
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_mongo(cls, data: dict):
+        """Create from a user_stats document, leaving out counters that dropped to zero."""
+        return cls(
+            total=data.get("total", 0),
+            by_status={k: v for k, v in (data.get("by_status") or {}).items() if v},
+            by_content_type={k: v for k, v in (data.get("by_content_type") or {}).items() if v},
+            by_difficulty={k: v for k, v in (data.get("by_difficulty") or {}).items() if v},
+            updated_at=data.get("updated_at")
+        )
+
+class ContentArtifact(BaseModel):
+    """A heavy generation artifact (study materials, key concepts, agent metadata)"""
+    content_id: str
+    name: str
+    data: Any = None
+
 class ContentGenerationCreate(BaseModel):
     """Model for creating new content generation request"""
     topic: str = Field(..., min_length=1, max_length=200)
@@ -88,8 +177,9 @@ class ContentGenerationCreate(BaseModel):
 
 class ContentGenerationUpdate(BaseModel):
     """Model for updating content generation"""
-    status: Optional[str] = Field(None, pattern="^(pending|processing|completed|failed)$")
+    status: Optional[str] = Field(None, pattern="^(pending|processing|completed|failed|cancelled)$")
     generated_content: Optional[str] = None
     completion_timestamp: Optional[datetime] = None
     error_message: Optional[str] = None
+    partial: Optional[bool] = None
     metadata: Optional[dict] = {}
@@ -52,6 +52,13 @@ class UserResponse(UserBase):
         json_encoders={ObjectId: str}
     )
 
+class Principal(BaseModel):
+    """The caller as described by the signed claims of their access token"""
+    id: str
+    email: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
 class UserInDB(UserResponse):
     hashed_password: str
 
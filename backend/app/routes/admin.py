@@ -0,0 +1,256 @@
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Body
+from app.models.user import UserCreate, UserResponse
+from app.routes.auth import get_current_user
+from app.utils.indexes import get_index_usage_stats
+from app.utils.database import get_db_telemetry
+from app.utils.security import password_hasher, token_cache
+from app.services.content_service import ContentService
+from app.services.archive_service import ArchiveService
+from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
+from app.services.user_service import UserService
+from app.services.revocation_service import RevocationService
+from app.services.login_throttle import LoginThrottle
+from app.dependencies import get_user_service, get_revocation_service, get_login_throttle, get_content_service, get_archive_service, get_search_service, get_stats_service
+from typing import List, Optional
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+async def get_current_admin(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    """Require the current user to be listed in ADMIN_EMAILS."""
+    if current_user.email.lower() not in {email.lower() for email in settings.admin_emails}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+@router.get("/db/indexes")
+async def get_index_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    """Get usage statistics for the managed MongoDB indexes."""
+    try:
+        stats = await get_index_usage_stats()
+        logger.info(f"📊 Index usage stats retrieved by {current_admin.email}")
+        return stats
+        
+    except Exception as e:
+        logger.error(f"💥 Error retrieving index stats: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve index stats: {str(e)}"
+        )
+
+@router.get("/db/pool")
+async def get_pool_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    """Get MongoDB connection pool saturation, checkout waits and per-command latency."""
+    return get_db_telemetry()
+
+@router.get("/db/explain")
+async def explain_content_queries(
+    user_id: Optional[str] = Query(None, description="User whose history query to explain; defaults to the caller"),
+    content_service: ContentService = Depends(get_content_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Run explain() on the history and pending-jobs queries and summarize the chosen plans."""
+    try:
+        logger.info(f"🔍 Query explain requested by {current_admin.email}")
+        return await content_service.explain_queries(user_id or current_admin.id)
+        
+    except Exception as e:
+        logger.error(f"💥 Error explaining content queries: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to explain content queries: {str(e)}"
+        )
+
+@router.get("/auth")
+async def get_auth_stats(
+    login_throttle: LoginThrottle = Depends(get_login_throttle),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Get password hashing pool load and login throttling counters."""
+    return {
+        "password_hashing": password_hasher.get_stats(),
+        "login_throttle": login_throttle.get_stats(),
+    }
+
+@router.get("/cache")
+async def get_cache_stats(
+    user_service: UserService = Depends(get_user_service),
+    revocation_service: RevocationService = Depends(get_revocation_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Get hit rates and sizes of the in-process caches."""
+    return {
+        "users": user_service.user_cache.get_stats(),
+        "tokens": token_cache.get_stats(),
+        "revocations": revocation_service.get_stats(),
+    }
+
+@router.post("/users/import")
+async def import_users(
+    users: List[UserCreate] = Body(..., min_length=1, max_length=1000),
+    user_service: UserService = Depends(get_user_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Create up to 1000 users (e.g. a class roster) in one insert; existing emails are reported, not overwritten."""
+    try:
+        logger.info(f"👥 Import of {len(users)} users requested by {current_admin.email}")
+        return await user_service.import_users(users)
+        
+    except Exception as e:
+        logger.error(f"💥 Error importing users: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import users: {str(e)}"
+        )
+
+@router.post("/users/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: str,
+    user_service: UserService = Depends(get_user_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Deactivate a user; their existing tokens stop authenticating."""
+    try:
+        user = await user_service.deactivate_user(user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        logger.info(f"🚫 User {user_id} deactivated by {current_admin.email}")
+        return user
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error deactivating user: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to deactivate user: {str(e)}"
+        )
+
+@router.post("/users/{user_id}/reactivate", response_model=UserResponse)
+async def reactivate_user(
+    user_id: str,
+    user_service: UserService = Depends(get_user_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Reactivate a deactivated user; they need to log in again."""
+    try:
+        user = await user_service.reactivate_user(user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        logger.info(f"✅ User {user_id} reactivated by {current_admin.email}")
+        return user
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error reactivating user: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reactivate user: {str(e)}"
+        )
+
+@router.post("/users/{user_id}/revoke-tokens")
+async def revoke_user_tokens(
+    user_id: str,
+    revocation_service: RevocationService = Depends(get_revocation_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Reject every token issued to a user so far; they can log in again for a new one."""
+    try:
+        await revocation_service.revoke_tokens(user_id)
+        logger.info(f"🔒 Tokens of user {user_id} revoked by {current_admin.email}")
+        return {"message": "Tokens revoked"}
+        
+    except Exception as e:
+        logger.error(f"💥 Error revoking tokens: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to revoke tokens: {str(e)}"
+        )
+
+@router.get("/archive")
+async def get_archive_stats(
+    archive_service: ArchiveService = Depends(get_archive_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Get archival counters and hot/cold tier document counts."""
+    try:
+        return await archive_service.get_stats()
+        
+    except Exception as e:
+        logger.error(f"💥 Error retrieving archive stats: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve archive stats: {str(e)}"
+        )
+
+@router.post("/archive/run")
+async def run_archive(
+    older_than_days: Optional[int] = Query(None, ge=1),
+    archive_service: ArchiveService = Depends(get_archive_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Move finished content older than older_than_days (default ARCHIVE_AFTER_DAYS) to the cold tier."""
+    try:
+        logger.info(f"🧊 Archival run requested by {current_admin.email}")
+        return await archive_service.archive_old_content(older_than_days=older_than_days)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"💥 Error archiving content: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to archive content: {str(e)}"
+        )
+
+@router.post("/search/reindex")
+async def reindex_search(
+    search_service: SearchService = Depends(get_search_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Rebuild the content_search collection from all completed content."""
+    try:
+        logger.info(f"🔎 Search reindex requested by {current_admin.email}")
+        indexed = await search_service.reindex_all()
+        return {"indexed": indexed}
+        
+    except Exception as e:
+        logger.error(f"💥 Error reindexing search: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reindex search: {str(e)}"
+        )
+
+@router.post("/stats/reconcile")
+async def reconcile_stats(
+    stats_service: StatsService = Depends(get_stats_service),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    """Rebuild every user's content counters from the content collections."""
+    try:
+        logger.info(f"📊 Content stats reconciliation requested by {current_admin.email}")
+        users = await stats_service.reconcile()
+        return {"users": users}
+        
+    except Exception as e:
+        logger.error(f"💥 Error reconciling content stats: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reconcile content stats: {str(e)}"
+        )
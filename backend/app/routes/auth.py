@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.models.user import UserCreate, UserLogin, UserResponse, Token
+from app.models.user import UserCreate, UserLogin, UserResponse, Principal, Token
 from app.services.user_service import UserService
+from app.services.revocation_service import RevocationService
+from app.services.login_throttle import LoginThrottle
 from app.utils.security import verify_token
+from app.utils.password_hashing import PasswordHashingBusy
+from app.dependencies import get_user_service, get_revocation_service, get_login_throttle
 from typing import Optional
 import logging
 
@@ -11,20 +15,57 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
-    """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    payload = verify_token(token)
+def _verified_claims(credentials: HTTPAuthorizationCredentials,
+                     revocation_service: RevocationService) -> dict:
+    """Decode the bearer token and reject it if its user's tokens are revoked."""
+    payload = verify_token(credentials.credentials)
     
-    if payload is None:
+    if payload is None or not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_service = UserService()
-    user = await user_service.get_user_by_id(payload.get("sub"))
+    if revocation_service.is_revoked(payload["sub"], payload.get("iat")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return payload
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    revocation_service: RevocationService = Depends(get_revocation_service)
+) -> Principal:
+    """
+    Get the caller from the signed claims of their JWT, without loading the user.
+    
+    For routes that only need the caller's id (ownership checks). Revoked
+    and deactivated users are rejected from the in-memory revocation list,
+    which may lag changes made on other nodes by up to
+    AUTH_REVOCATION_REFRESH_SECONDS. Use get_current_user for anything that
+    needs the current user document.
+    """
+    payload = _verified_claims(credentials, revocation_service)
+    return Principal(
+        id=payload["sub"],
+        email=payload.get("email"),
+        first_name=payload.get("first_name"),
+        last_name=payload.get("last_name")
+    )
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service),
+    revocation_service: RevocationService = Depends(get_revocation_service)
+) -> UserResponse:
+    """Get current authenticated user from JWT token."""
+    payload = _verified_claims(credentials, revocation_service)
+    
+    user = await user_service.get_cached_user(payload["sub"])
     
     if user is None:
         raise HTTPException(
@@ -33,14 +74,36 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     return user
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user: UserCreate):
+async def register(
+    user: UserCreate,
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+    login_throttle: LoginThrottle = Depends(get_login_throttle)
+):
     """Register a new user."""
     try:
         logger.info(f"🔄 Attempting to register user: {user.email}")
-        user_service = UserService()
+        
+        # Signups hash a password too; share the per-IP login budget
+        client_ip = request.client.host if request.client else None
+        retry_after = await login_throttle.check_registration(client_ip)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(int(retry_after))},
+            )
+        
         new_user = await user_service.create_user(user)
         logger.info(f"✅ User created successfully: {new_user.email}")
         
@@ -53,6 +116,15 @@ async def register(user: UserCreate):
             token_type="bearer",
             user=new_user
         )
+    except HTTPException:
+        raise
+    except PasswordHashingBusy as e:
+        logger.warning(f"⏳ Registration deferred, password hashing saturated: {user.email}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         logger.warning(f"❌ Validation error during registration: {str(e)}")
         raise HTTPException(
@@ -67,11 +139,26 @@ async def register(user: UserCreate):
         )
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin):
+async def login(
+    user_credentials: UserLogin,
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+    login_throttle: LoginThrottle = Depends(get_login_throttle)
+):
     """Authenticate user and return JWT token."""
     try:
         logger.info(f"🔐 Attempting login for user: {user_credentials.email}")
-        user_service = UserService()
+        
+        # Turn bursts away before spending any bcrypt time on them
+        client_ip = request.client.host if request.client else None
+        retry_after = await login_throttle.check(user_credentials.email, client_ip)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(int(retry_after))},
+            )
+        
         user = await user_service.authenticate_user(
             user_credentials.email, 
             user_credentials.password
@@ -85,6 +172,8 @@ async def login(user_credentials: UserLogin):
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        await login_throttle.record_success(user.email)
+        
         # Create access token
         access_token = user_service.create_user_token(user)
         logger.info(f"✅ Login successful for user: {user.email}")
@@ -96,6 +185,13 @@ async def login(user_credentials: UserLogin):
         )
     except HTTPException:
         raise
+    except PasswordHashingBusy as e:
+        logger.warning(f"⏳ Login deferred, password hashing saturated: {user_credentials.email}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"💥 Unexpected error during login: {str(e)}", exc_info=True)
         raise HTTPException(
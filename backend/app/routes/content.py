@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
-from app.models.content import ContentGenerationCreate, ContentGenerationResponse, ContentGenerationUpdate
-from app.models.user import UserResponse
+from fastapi import APIRouter, HTTPException, Depends, status, Query
+from app.models.content import ContentGenerationCreate, ContentGenerationResponse, ContentGenerationUpdate, ContentSummary, ContentHistoryPage, ContentSearchPage, UserContentStats, ContentArtifact
+from app.models.user import Principal
 from app.services.content_service import ContentService
 from app.services.agent_service import AgentService
-from app.routes.auth import get_current_user
-from typing import List
+from app.services.artifact_service import ArtifactService, ARTIFACT_NAMES
+from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
+from app.services.job_manager import job_manager, TERMINAL_STATUSES
+from app.routes.auth import get_current_principal
+from app.dependencies import get_content_service, get_agent_service, get_artifact_service, get_search_service, get_stats_service
+from app.config import settings
+from app.utils.serialization import fast_response
+from typing import List, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,16 +21,14 @@ router = APIRouter(prefix="/content", tags=["content"])
 @router.post("/generate", response_model=ContentGenerationResponse, status_code=status.HTTP_201_CREATED)
 async def create_content_request(
     content_data: ContentGenerationCreate,
-    background_tasks: BackgroundTasks,
-    current_user: UserResponse = Depends(get_current_user)
+    content_service: ContentService = Depends(get_content_service),
+    agent_service: AgentService = Depends(get_agent_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Create a new content generation request and trigger AI generation."""
     try:
         logger.info(f"🔄 Content generation request from user {current_user.id}: {content_data.topic}")
         
-        content_service = ContentService()
-        agent_service = AgentService()
-        
         # Create the content request in database
         content_request = await content_service.create_content_request(
             user_id=current_user.id,
@@ -32,8 +37,9 @@ async def create_content_request(
         
         logger.info(f"✅ Content request created successfully: {content_request.id}")
         
-        # Add background task to generate content using AI agent
-        background_tasks.add_task(
+        # Start a cancellable background job to generate content using AI agent
+        job_manager.submit(
+            content_request.id,
             agent_service.process_content_generation,
             content_id=content_request.id,
             topic=content_data.topic,
@@ -52,23 +58,29 @@ async def create_content_request(
             detail=f"Failed to create content request: {str(e)}"
         )
 
-@router.get("/history", response_model=List[ContentGenerationResponse])
+@router.get("/history", response_model=List[Union[ContentGenerationResponse, ContentSummary]])
 async def get_content_history(
-    limit: int = 20,
-    current_user: UserResponse = Depends(get_current_user)
+    limit: int = Query(20, ge=1, le=settings.history_max_page_size),
+    summary: bool = False,
+    content_service: ContentService = Depends(get_content_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Get content generation history for the current user."""
+    """
+    Get content generation history for the current user.
+    
+    Pass summary=true for a lightweight list without content bodies.
+    """
     try:
         logger.info(f"📚 Retrieving content history for user {current_user.id}")
         
-        content_service = ContentService()
         content_history = await content_service.get_user_content_history(
             user_id=current_user.id,
-            limit=limit
+            limit=limit,
+            summary=summary
         )
         
         logger.info(f"✅ Retrieved {len(content_history)} content items for user {current_user.id}")
-        return content_history
+        return fast_response(content_history)
         
     except Exception as e:
         logger.error(f"💥 Error retrieving content history: {str(e)}", exc_info=True)
@@ -77,16 +89,111 @@ async def get_content_history(
             detail=f"Failed to retrieve content history: {str(e)}"
         )
 
+@router.get("/history/page", response_model=ContentHistoryPage)
+async def get_content_history_page(
+    limit: int = Query(20, ge=1, le=settings.history_max_page_size),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(pending|processing|completed|failed|cancelled)$"),
+    content_type: Optional[str] = Query(None, max_length=50),
+    content_service: ContentService = Depends(get_content_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Get one page of content history summaries for the current user.
+    
+    Pass the returned next_cursor as cursor to fetch the following page.
+    """
+    try:
+        logger.info(f"📚 Retrieving content history page for user {current_user.id}")
+        
+        items, next_cursor = await content_service.get_user_content_page(
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            status=status_filter,
+            content_type=content_type
+        )
+        
+        return fast_response(ContentHistoryPage.model_construct(items=items, next_cursor=next_cursor))
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"💥 Error retrieving content history page: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve content history: {str(e)}"
+        )
+
+@router.get("/search", response_model=ContentSearchPage)
+async def search_content(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=settings.history_max_page_size),
+    offset: int = Query(0, ge=0),
+    search_service: SearchService = Depends(get_search_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Search the current user's generated content by topic, body and key concepts.
+    
+    Results are ranked by relevance; pass the returned next_offset as offset
+    to fetch the following page.
+    """
+    try:
+        logger.info(f"🔎 Searching content for user {current_user.id}: {q}")
+        
+        items, next_offset = await search_service.search(
+            user_id=current_user.id,
+            query=q,
+            limit=limit,
+            offset=offset
+        )
+        
+        return fast_response(ContentSearchPage.model_construct(items=items, next_offset=next_offset))
+        
+    except Exception as e:
+        logger.error(f"💥 Error searching content: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search content: {str(e)}"
+        )
+
+@router.get("/stats", response_model=UserContentStats)
+async def get_content_stats(
+    stats_service: StatsService = Depends(get_stats_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Get the current user's content counts by status, content type and difficulty.
+    
+    Served from counters maintained as content changes, so the cost does
+    not grow with the size of the user's history.
+    """
+    try:
+        user_stats = await stats_service.get_user_stats(current_user.id)
+        logger.info(f"📊 Content stats retrieved for user {current_user.id}")
+        return fast_response(user_stats)
+        
+    except Exception as e:
+        logger.error(f"💥 Error retrieving content stats: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve content stats: {str(e)}"
+        )
+
 @router.get("/{content_id}", response_model=ContentGenerationResponse)
 async def get_content_by_id(
     content_id: str,
-    current_user: UserResponse = Depends(get_current_user)
+    content_service: ContentService = Depends(get_content_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get specific content generation by ID."""
     try:
         logger.info(f"🔍 Retrieving content {content_id} for user {current_user.id}")
         
-        content_service = ContentService()
         content = await content_service.get_content_by_id(content_id)
         
         if not content:
@@ -103,7 +210,7 @@ async def get_content_by_id(
             )
         
         logger.info(f"✅ Content {content_id} retrieved successfully for user {current_user.id}")
-        return content
+        return fast_response(content)
         
     except HTTPException:
         raise
@@ -114,38 +221,160 @@ async def get_content_by_id(
             detail=f"Failed to retrieve content: {str(e)}"
         )
 
+@router.get("/{content_id}/wait", response_model=ContentGenerationResponse)
+async def wait_for_content(
+    content_id: str,
+    timeout: float = Query(30, ge=0, le=settings.content_wait_max_timeout),
+    content_service: ContentService = Depends(get_content_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Long-poll until content generation finishes or the timeout passes."""
+    try:
+        # Register before reading so a completion in between still wakes us
+        waiter = job_manager.register_waiter(content_id)
+        try:
+            content = await content_service.get_content_by_id(content_id)
+            
+            if not content:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Content not found"
+                )
+            
+            # Ensure user can only access their own content
+            if content.user_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Access denied to this content"
+                )
+            
+            if content.status in TERMINAL_STATUSES:
+                return fast_response(content)
+            
+            logger.info(f"⏳ Waiting up to {timeout}s for content {content_id} (status: {content.status})")
+            finished_status = await job_manager.wait(waiter, timeout)
+        finally:
+            job_manager.discard_waiter(content_id, waiter)
+        
+        if finished_status is None:
+            # Timed out: return the current state and let the client wait again
+            return fast_response(content)
+        
+        content = await content_service.get_content_by_id(content_id)
+        if not content:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Content not found"
+            )
+        
+        return fast_response(content)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error waiting for content {content_id}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to wait for content: {str(e)}"
+        )
+
+@router.get("/{content_id}/artifacts/{name}", response_model=ContentArtifact)
+async def get_content_artifact(
+    content_id: str,
+    name: str,
+    content_service: ContentService = Depends(get_content_service),
+    artifact_service: ArtifactService = Depends(get_artifact_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Get a heavy generation artifact (study_materials, key_concepts, generation_metadata)."""
+    try:
+        if name not in ARTIFACT_NAMES:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown artifact: {name}"
+            )
+        
+        # Ownership check only needs user_id, not the whole document
+        access_info = await content_service.get_content_access_info(content_id)
+        if not access_info:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Content not found"
+            )
+        
+        if access_info["user_id"] != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this content"
+            )
+        
+        data = await artifact_service.get_artifact(content_id, name)
+        if data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Artifact {name} not found for this content"
+            )
+        
+        logger.info(f"✅ Artifact {name} of content {content_id} retrieved for user {current_user.id}")
+        return ContentArtifact(content_id=content_id, name=name, data=data)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error retrieving artifact {name} for content {content_id}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve artifact: {str(e)}"
+        )
+
 @router.put("/{content_id}", response_model=ContentGenerationResponse)
 async def update_content(
     content_id: str,
     update_data: ContentGenerationUpdate,
-    current_user: UserResponse = Depends(get_current_user)
+    content_service: ContentService = Depends(get_content_service),
+    artifact_service: ArtifactService = Depends(get_artifact_service),
+    search_service: SearchService = Depends(get_search_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Update content generation (admin or owner only)."""
     try:
         logger.info(f"🔄 Updating content {content_id} by user {current_user.id}")
         
-        content_service = ContentService()
-        
-        # First check if content exists and user has access
-        existing_content = await content_service.get_content_by_id(content_id)
-        if not existing_content:
+        # First check if content exists and user has access (owner and status only)
+        access_info = await content_service.get_content_access_info(content_id)
+        if not access_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Content not found"
             )
         
-        if existing_content.user_id != current_user.id:
+        if access_info["user_id"] != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to update this content"
             )
         
+        if access_info.get("archived"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Content is archived and can no longer be modified"
+            )
+        
         updated_content = await content_service.update_content_status(content_id, update_data)
         
         if not updated_content:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Content not found or no changes made"
+                detail="Content not found"
+            )
+        
+        # Keep search in step with edited or newly completed content
+        if updated_content.status == "completed" and (update_data.generated_content is not None or update_data.status is not None):
+            key_concepts = await artifact_service.get_artifact(content_id, "key_concepts")
+            await search_service.index_content(
+                content_id,
+                updated_content.generated_content,
+                key_concepts if isinstance(key_concepts, list) else []
             )
         
         logger.info(f"✅ Content {content_id} updated successfully by user {current_user.id}")
@@ -163,28 +392,33 @@ async def update_content(
 @router.delete("/{content_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_content(
     content_id: str,
-    current_user: UserResponse = Depends(get_current_user)
+    content_service: ContentService = Depends(get_content_service),
+    artifact_service: ArtifactService = Depends(get_artifact_service),
+    search_service: SearchService = Depends(get_search_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Delete content generation (owner only)."""
     try:
         logger.info(f"🗑️ Deleting content {content_id} by user {current_user.id}")
         
-        content_service = ContentService()
-        
-        # First check if content exists and user has access
-        existing_content = await content_service.get_content_by_id(content_id)
-        if not existing_content:
+        # First check if content exists and user has access (owner and status only)
+        access_info = await content_service.get_content_access_info(content_id)
+        if not access_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Content not found"
             )
         
-        if existing_content.user_id != current_user.id:
+        if access_info["user_id"] != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to delete this content"
             )
         
+        # Deleting implies cancelling: stop paying for a result nobody can read
+        if job_manager.cancel(content_id):
+            logger.info(f"🛑 Cancelled running generation for deleted content {content_id}")
+        
         success = await content_service.delete_content(content_id, current_user.id)
         
         if not success:
@@ -193,6 +427,9 @@ async def delete_content(
                 detail="Content not found or could not be deleted"
             )
         
+        await artifact_service.delete_artifacts(content_id)
+        await search_service.remove_content(content_id, current_user.id)
+        
         logger.info(f"✅ Content {content_id} deleted successfully by user {current_user.id}")
         
     except HTTPException:
@@ -204,33 +441,88 @@ async def delete_content(
             detail=f"Failed to delete content: {str(e)}"
         )
 
+@router.post("/{content_id}/cancel", response_model=ContentGenerationResponse)
+async def cancel_content(
+    content_id: str,
+    content_service: ContentService = Depends(get_content_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Cancel an in-flight content generation (owner only)."""
+    try:
+        logger.info(f"🛑 Cancelling content {content_id} for user {current_user.id}")
+        
+        # First check if content exists and user has access (owner and status only)
+        access_info = await content_service.get_content_access_info(content_id)
+        if not access_info:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Content not found"
+            )
+        
+        if access_info["user_id"] != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to cancel this content"
+            )
+        
+        if access_info["status"] in TERMINAL_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Content generation already {access_info['status']}"
+            )
+        
+        job_manager.cancel(content_id)
+        
+        cancelled_content = await content_service.mark_content_cancelled(content_id)
+        if not cancelled_content:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Content not found or could not be cancelled"
+            )
+        
+        logger.info(f"✅ Content {content_id} cancelled by user {current_user.id}")
+        return cancelled_content
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error cancelling content {content_id}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to cancel content: {str(e)}"
+        )
+
 @router.post("/{content_id}/regenerate", response_model=ContentGenerationResponse)
 async def regenerate_content(
     content_id: str,
-    background_tasks: BackgroundTasks,
-    current_user: UserResponse = Depends(get_current_user)
+    content_service: ContentService = Depends(get_content_service),
+    agent_service: AgentService = Depends(get_agent_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Regenerate content for an existing request using AI agent."""
     try:
         logger.info(f"🔄 Regenerating content {content_id} for user {current_user.id}")
         
-        content_service = ContentService()
-        agent_service = AgentService()
-        
-        # First check if content exists and user has access
-        existing_content = await content_service.get_content_by_id(content_id)
-        if not existing_content:
+        # First check if content exists and user has access (owner and status only)
+        access_info = await content_service.get_content_access_info(content_id)
+        if not access_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Content not found"
             )
         
-        if existing_content.user_id != current_user.id:
+        if access_info["user_id"] != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to regenerate this content"
             )
         
+        if access_info.get("archived"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Content is archived and can no longer be modified"
+            )
+        
         # Reset status to pending for regeneration
         update_data = ContentGenerationUpdate(status="pending")
         updated_content = await content_service.update_content_status(content_id, update_data)
@@ -241,8 +533,9 @@ async def regenerate_content(
                 detail="Content not found or could not be updated"
             )
         
-        # Add background task to regenerate content using AI agent
-        background_tasks.add_task(
+        # Start a background job to regenerate content, replacing any running one
+        job_manager.submit(
+            content_id,
             agent_service.regenerate_content,
             content_id=content_id
         )
@@ -262,10 +555,11 @@ async def regenerate_content(
         )
 
 @router.get("/agents/status")
-async def get_agents_status():
+async def get_agents_status(
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Get the status of all AI agents."""
     try:
-        agent_service = AgentService()
         status = agent_service.get_agent_status()
         
         logger.info(f"📊 Agent status retrieved: {status['overall_status']}")
@@ -279,12 +573,13 @@ async def get_agents_status():
         )
 
 @router.post("/agents/test")
-async def test_agents():
+async def test_agents(
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Test the connection and functionality of AI agents."""
     try:
         logger.info("🧪 Testing AI agents connection and functionality")
         
-        agent_service = AgentService()
         test_result = await agent_service.test_agent_connection()
         
         if test_result['success']:
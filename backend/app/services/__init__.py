@@ -1,9 +1,15 @@
 from .user_service import UserService
 from .content_service import ContentService
 from .agent_service import AgentService
+from .artifact_service import ArtifactService
+from .archive_service import ArchiveService
+from .search_service import SearchService
 
 __all__ = [
     "UserService",
     "ContentService",
-    "AgentService"
+    "AgentService",
+    "ArtifactService",
+    "ArchiveService",
+    "SearchService"
 ]
@@ -1,7 +1,11 @@
 from typing import Optional, Dict, Any
 from app.models.content import ContentGenerationUpdate
 from app.services.content_service import ContentService
+from app.services.artifact_service import ArtifactService
+from app.services.search_service import SearchService
+from app.config import settings
 from agents.content_generator_agent import ContentGeneratorAgent
+import asyncio
 import logging
 from dotenv import load_dotenv
 
@@ -10,12 +14,19 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Extra time allowed past a job deadline before the whole job is abandoned
+DEADLINE_GRACE_SECONDS = 5.0
+
 class AgentService:
     """Service for managing AI agents and their interactions"""
     
-    def __init__(self):
+    def __init__(self, content_service: Optional[ContentService] = None,
+                 artifact_service: Optional[ArtifactService] = None,
+                 search_service: Optional[SearchService] = None):
         self.content_agent = ContentGeneratorAgent()
-        self._content_service = None  # Lazy initialization
+        self._content_service = content_service  # Lazy initialization when not injected
+        self._artifact_service = artifact_service  # Lazy initialization when not injected
+        self._search_service = search_service  # Lazy initialization when not injected
     
     @property
     def content_service(self):
@@ -28,11 +39,28 @@ class AgentService:
                 raise Exception(f"ContentService initialization failed: {str(e)}")
         return self._content_service
     
+    @property
+    def artifact_service(self):
+        """Lazy initialization of ArtifactService, for the same reason as content_service."""
+        if self._artifact_service is None:
+            self._artifact_service = ArtifactService()
+        return self._artifact_service
+    
+    @property
+    def search_service(self):
+        """Lazy initialization of SearchService, for the same reason as content_service."""
+        if self._search_service is None:
+            self._search_service = SearchService(artifact_service=self.artifact_service)
+        return self._search_service
+    
     async def process_content_generation(self, content_id: str, topic: str, difficulty_level: str, 
                                        content_type: str, subject: str = "General") -> Dict[str, Any]:
         """
         Process content generation request using the ContentGeneratorAgent
         
+        The job runs under the deadline configured for its content_type. Stages
+        that miss it are dropped and the content is completed flagged partial.
+        
         Args:
             content_id (str): ID of the content generation request
             topic (str): Topic to generate content for
@@ -43,55 +71,101 @@ class AgentService:
         Returns:
             dict: Generated content and metadata
         """
+        budget = settings.get_generation_deadline(content_type)
+        deadline = asyncio.get_running_loop().time() + budget
+        artifacts_saved = False
+        completed = None
+        
         try:
             logger.info(f"🔄 Processing content generation request {content_id} for topic: {topic}")
             
+            # Claim the request: only a pending request may move to processing.
+            # A request that was cancelled or claimed by another run belongs to
+            # someone else, so back off without writing anything.
+            claimed = await self.content_service.update_content_status(
+                content_id,
+                ContentGenerationUpdate(status="processing"),
+                expected_status="pending"
+            )
+            if claimed is None:
+                logger.warning(f"⚠️ Content request {content_id} is no longer pending, skipping generation")
+                return {
+                    'success': False,
+                    'content_id': content_id,
+                    'error': "Content request is no longer pending"
+                }
+            
             # Check if agent is available
             if not self.content_agent.is_available():
                 raise Exception("ContentGeneratorAgent is not available")
             
-            # Update status to processing
-            await self.content_service.update_content_status(
-                content_id,
-                ContentGenerationUpdate(status="processing")
-            )
-            
-            # Generate content using the agent
-            generated_content = await self.content_agent.generate_content(
-                topic=topic,
-                difficulty_level=difficulty_level,
-                content_type=content_type,
-                subject=subject
-            )
+            # Generate content using the agent within the job deadline
+            try:
+                # The agent enforces the deadline per stage; the outer guard only
+                # catches anything that fails to honour it
+                generated_content = await asyncio.wait_for(
+                    self.content_agent.generate_content(
+                        topic=topic,
+                        difficulty_level=difficulty_level,
+                        content_type=content_type,
+                        subject=subject,
+                        deadline=deadline
+                    ),
+                    timeout=budget + DEADLINE_GRACE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                raise Exception(f"Generation deadline of {budget:g}s exceeded")
             
             # Extract the main content
             main_content = generated_content.get('content', '')
             study_materials = generated_content.get('study_materials', {})
             key_concepts = generated_content.get('key_concepts', [])
+            partial = generated_content.get('partial', False)
             metadata = generated_content.get('metadata', {})
             
+            # Heavy outputs go to content_artifacts so the content document that
+            # history, status and ownership checks read stays small
+            artifacts = {'generation_metadata': metadata, 'key_concepts': key_concepts}
+            if study_materials:
+                artifacts['study_materials'] = study_materials
+            # Flagged before the save: a failed or cancelled save may already
+            # have written some of them
+            artifacts_saved = True
+            artifact_names = await self.artifact_service.save_artifacts(content_id, artifacts)
+            
             # Update the content in the database
             update_data = ContentGenerationUpdate(
                 status="completed",
                 generated_content=main_content,
+                partial=partial,
                 metadata={
-                    **metadata,
-                    'study_materials': study_materials,
-                    'key_concepts': key_concepts,
-                    'agent_used': 'ContentGeneratorAgent'
+                    'agent_used': 'ContentGeneratorAgent',
+                    'artifacts': artifact_names,
+                    'missing_stages': metadata.get('missing_stages', [])
                 }
             )
             
-            updated_content = await self.content_service.update_content_status(content_id, update_data)
+            completed = await self.content_service.update_content_status(
+                content_id,
+                update_data,
+                expected_status="processing"
+            )
             
-            if not updated_content:
+            if completed is None:
                 raise Exception("Failed to update content status after generation")
             
-            logger.info(f"✅ Content generation completed successfully for request {content_id}")
+            # Indexing failures are logged by the search service and never fail the job
+            await self.search_service.index_content(content_id, main_content, key_concepts)
+            
+            if partial:
+                logger.info(f"⚠️ Content generation completed with partial results for request {content_id}")
+            else:
+                logger.info(f"✅ Content generation completed successfully for request {content_id}")
             
             return {
                 'success': True,
                 'content_id': content_id,
+                'partial': partial,
                 'generated_content': main_content,
                 'study_materials': study_materials,
                 'key_concepts': key_concepts,
@@ -108,7 +182,10 @@ class AgentService:
                     ContentGenerationUpdate(
                         status="failed",
                         error_message=str(e)
-                    )
+                    ),
+                    # Only the processing state this run claimed; never overwrite
+                    # a request that was cancelled or finished meanwhile
+                    expected_status="processing"
                 )
             except Exception as update_error:
                 logger.error(f"Failed to update error status: {update_error}")
@@ -118,6 +195,13 @@ class AgentService:
                 'content_id': content_id,
                 'error': str(e)
             }
+        
+        finally:
+            # Artifacts are written before the guarded completion; when that did
+            # not land (failed, cancelled, deleted, guard lost) nothing points at
+            # them. In finally so a cancelled job cleans up too.
+            if artifacts_saved and completed is None:
+                await self.artifact_service.delete_artifacts(content_id)
     
     async def regenerate_content(self, content_id: str) -> Dict[str, Any]:
         """
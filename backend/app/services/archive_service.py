@@ -0,0 +1,138 @@
+from typing import Optional
+from datetime import datetime, timedelta
+from pymongo import ReplaceOne
+from app.config import settings
+from app.utils.database import get_collection
+from app.utils.compression import compress_text
+from app.services.job_manager import TERMINAL_STATUSES
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cold tier for finished content generations past the archive age
+ARCHIVE_COLLECTION = "content_archive"
+
+class ArchiveService:
+    """
+    Moves old finished content generations from content_generations to content_archive.
+
+    Archived documents keep their _id and list fields, so ContentService can
+    fall through to the cold tier for single reads and history. Bodies are
+    always stored compressed there, whatever their size.
+    """
+
+    def __init__(self):
+        self.collection = get_collection("content_generations")
+        self.archive_collection = get_collection(ARCHIVE_COLLECTION)
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "runs": 0,
+            "archived_documents": 0,
+            "skipped_documents": 0,
+            "last_run_at": None,
+        }
+
+    def _to_archive_doc(self, content_doc: dict, archived_at: datetime) -> dict:
+        archive_doc = dict(content_doc)
+        generated_content = archive_doc.get("generated_content")
+        if isinstance(generated_content, str):
+            archive_doc.setdefault("content_length", len(generated_content))
+            archive_doc["generated_content"] = compress_text(generated_content, threshold=1)
+        archive_doc["archived_at"] = archived_at
+        return archive_doc
+
+    async def archive_old_content(self, older_than_days: Optional[int] = None,
+                                  batch_size: Optional[int] = None) -> dict:
+        """
+        Archive finished content requested more than older_than_days ago.
+
+        Each batch is copied to the cold collection (idempotent upserts), then
+        removed from the hot collection only if it is still finished, so a
+        regeneration that starts mid-run keeps its document hot. Cold copies
+        of documents that stayed hot are removed again. Raises ValueError
+        when no positive age is configured or given.
+        """
+        older_than_days = settings.archive_after_days if older_than_days is None else older_than_days
+        if older_than_days <= 0:
+            raise ValueError("Archival is disabled; set ARCHIVE_AFTER_DAYS or pass older_than_days")
+        batch_size = batch_size or settings.archive_batch_size
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        query = {
+            "status": {"$in": list(TERMINAL_STATUSES)},
+            "request_timestamp": {"$lt": cutoff}
+        }
+
+        archived = 0
+        skipped = 0
+        while True:
+            content_docs = await self.collection.find(query).sort("request_timestamp", 1).limit(batch_size).to_list(length=batch_size)
+            if not content_docs:
+                break
+
+            archived_at = datetime.utcnow()
+            ids = [content_doc["_id"] for content_doc in content_docs]
+            await self.archive_collection.bulk_write(
+                [
+                    ReplaceOne({"_id": content_doc["_id"]}, self._to_archive_doc(content_doc, archived_at), upsert=True)
+                    for content_doc in content_docs
+                ],
+                ordered=False
+            )
+
+            result = await self.collection.delete_many({"_id": {"$in": ids}, **query})
+            archived += result.deleted_count
+
+            if result.deleted_count < len(ids):
+                # Whatever stayed hot is active again and will not match the next batch
+                still_hot = await self.collection.distinct("_id", {"_id": {"$in": ids}})
+                if still_hot:
+                    await self.archive_collection.delete_many({"_id": {"$in": still_hot}})
+                    skipped += len(still_hot)
+
+            if len(content_docs) < batch_size:
+                break
+
+        self._stats["runs"] += 1
+        self._stats["archived_documents"] += archived
+        self._stats["skipped_documents"] += skipped
+        self._stats["last_run_at"] = datetime.utcnow()
+
+        if archived:
+            logger.info(f"🧊 Archived {archived} content generations older than {older_than_days} days")
+        return {"archived": archived, "skipped": skipped, "cutoff": cutoff}
+
+    async def _run_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.archive_old_content()
+            except Exception as e:
+                logger.error(f"❌ Content archival run failed: {str(e)}")
+
+    def start(self) -> None:
+        """Start the periodic archival task if ARCHIVE_INTERVAL_HOURS and ARCHIVE_AFTER_DAYS are set."""
+        if settings.archive_interval_hours <= 0 or settings.archive_after_days <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_periodically(settings.archive_interval_hours * 3600))
+            logger.info(f"🧊 Content archival scheduled every {settings.archive_interval_hours}h")
+
+    async def stop(self) -> None:
+        """Cancel the periodic archival task."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def get_stats(self) -> dict:
+        """Get archival counters and the size of both tiers."""
+        return {
+            **self._stats,
+            "hot_documents": await self.collection.estimated_document_count(),
+            "archived_total": await self.archive_collection.estimated_document_count(),
+            "archive_after_days": settings.archive_after_days,
+        }
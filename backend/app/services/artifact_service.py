@@ -0,0 +1,95 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pymongo import ReplaceOne
+from bson import ObjectId
+from app.utils.database import get_collection
+from app.utils.compression import compress_text, decompress_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Heavy generation outputs kept out of the hot content_generations documents
+ARTIFACT_NAMES = ("study_materials", "key_concepts", "generation_metadata")
+
+# Artifacts that older documents kept inline under content_generations.metadata
+LEGACY_METADATA_ARTIFACTS = ("study_materials", "key_concepts")
+
+class ArtifactService:
+    """Stores large generation artifacts in content_artifacts, keyed by content id."""
+
+    def __init__(self):
+        self.collection = get_collection("content_artifacts")
+        self.content_collection = get_collection("content_generations")
+
+    def _deflate(self, data: Any) -> Any:
+        """Compress large strings at the top level of an artifact."""
+        if isinstance(data, str):
+            return compress_text(data)
+        if isinstance(data, dict):
+            return {key: compress_text(value) for key, value in data.items()}
+        return data
+
+    def _inflate(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {key: decompress_text(value) for key, value in data.items()}
+        return decompress_text(data)
+
+    async def save_artifacts(self, content_id: str, artifacts: Dict[str, Any]) -> List[str]:
+        """Store a content generation's artifacts, replacing any from a previous run."""
+        try:
+            now = datetime.utcnow()
+            operations = [
+                ReplaceOne(
+                    {"content_id": content_id, "name": name},
+                    {"content_id": content_id, "name": name, "data": self._deflate(data), "updated_at": now},
+                    upsert=True
+                )
+                for name, data in artifacts.items()
+            ]
+            if operations:
+                await self.collection.bulk_write(operations, ordered=False)
+            
+            # A regeneration may produce fewer artifacts (e.g. partial); drop stale ones
+            await self.collection.delete_many({"content_id": content_id, "name": {"$nin": list(artifacts)}})
+            
+            logger.info(f"✅ Saved {len(operations)} artifacts for content {content_id}")
+            return list(artifacts)
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving artifacts for content {content_id}: {str(e)}")
+            raise e
+
+    async def get_artifact(self, content_id: str, name: str) -> Optional[Any]:
+        """Get one artifact's data, or None if it does not exist."""
+        try:
+            artifact_doc = await self.collection.find_one(
+                {"content_id": content_id, "name": name},
+                {"data": 1}
+            )
+            if artifact_doc:
+                return self._inflate(artifact_doc.get("data"))
+            
+            # Fall back to documents written before artifacts were split out
+            if name in LEGACY_METADATA_ARTIFACTS:
+                content_doc = await self.content_collection.find_one(
+                    {"_id": ObjectId(content_id)},
+                    {f"metadata.{name}": 1}
+                )
+                legacy_data = ((content_doc or {}).get("metadata") or {}).get(name)
+                if legacy_data is not None:
+                    return self._inflate(legacy_data)
+            return None
+        except Exception as e:
+            logger.error(f"❌ Error getting artifact {name} for content {content_id}: {str(e)}")
+            return None
+
+    async def delete_artifacts(self, content_id: str) -> int:
+        """Delete every artifact of a content generation."""
+        try:
+            result = await self.collection.delete_many({"content_id": content_id})
+            if result.deleted_count:
+                logger.info(f"✅ Deleted {result.deleted_count} artifacts for content {content_id}")
+            return result.deleted_count
+        except Exception as e:
+            logger.error(f"❌ Error deleting artifacts for content {content_id}: {str(e)}")
+            return 0
@@ -1,19 +1,100 @@
-from typing import Optional, List
+from typing import Optional, List, Union, Iterable, Tuple
 from datetime import datetime
-from app.models.content import ContentGeneration, ContentGenerationCreate, ContentGenerationUpdate, ContentGenerationResponse
-from app.utils.database import get_collection
+from app.models.content import ContentGeneration, ContentGenerationCreate, ContentGenerationUpdate, ContentGenerationResponse, ContentSummary
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.compression import compress_text, decompress_text
+from app.utils.db_monitoring import summarize_explain
+from app.config import settings
+from app.utils.database import get_collection, get_read_collection
+from app.services.job_manager import job_manager, TERMINAL_STATUSES, ACTIVE_STATUSES
+from app.services.archive_service import ARCHIVE_COLLECTION
+from app.services.stats_service import StatsService
 from bson import ObjectId
+from pymongo import ReturnDocument
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Newest-first history order, served by the user_history_keyset index
+HISTORY_SORT = [("request_timestamp", -1), ("_id", -1)]
+
+# Oldest-first pending job queue, served by the partial pending_queue index
+PENDING_QUERY = {"status": "pending"}
+PENDING_SORT = [("request_timestamp", 1)]
+
+# Projection for history listings: everything a list row needs, no content bodies.
+# content_length is stored at write time; older documents fall back to measuring
+# the string server-side so the body still never crosses the wire.
+SUMMARY_PROJECTION = {
+    "topic": 1,
+    "difficulty_level": 1,
+    "content_type": 1,
+    "status": 1,
+    "request_timestamp": 1,
+    "completion_timestamp": 1,
+    "content_length": {
+        "$cond": [
+            {"$eq": [{"$type": "$content_length"}, "missing"]},
+            {
+                "$cond": [
+                    {"$eq": [{"$type": "$generated_content"}, "string"]},
+                    {"$strLenCP": "$generated_content"},
+                    0
+                ]
+            },
+            "$content_length"
+        ]
+    }
+}
+
+def _as_status_list(expected_status: Optional[Union[str, Iterable[str]]]) -> Optional[List[str]]:
+    if expected_status is None:
+        return None
+    return [expected_status] if isinstance(expected_status, str) else list(expected_status)
+
 class ContentService:
-    def __init__(self):
+    def __init__(self, stats_service: Optional[StatsService] = None):
         self.collection = get_collection("content_generations")
+        self.archive_collection = get_collection(ARCHIVE_COLLECTION)
+        self.stats_service = stats_service or StatsService()
+        self._read_collections = {}
+
+    def _reader(self, operation: str, collection_name: str = "content_generations"):
+        """Collection handle for a named read operation, routed per app/utils/read_routing.py."""
+        key = (collection_name, operation)
+        collection = self._read_collections.get(key)
+        if collection is None:
+            collection = get_read_collection(collection_name, operation)
+            self._read_collections[key] = collection
+        return collection
+
+    async def _find_sorted(self, operation: str, query: dict, projection: Optional[dict],
+                           limit: int) -> List[dict]:
+        """
+        Run a newest-first (request_timestamp, _id) query over the hot and cold tiers.
+
+        Documents move to the archive by status, not age, so an archived
+        document can be newer than everything on a full hot page. Both tiers
+        are always queried with the same bound and limit and merged.
+        """
+        content_docs, archived_docs = await asyncio.gather(
+            self._reader(operation).find(query, projection).sort(HISTORY_SORT).limit(limit).to_list(length=limit),
+            self._reader(operation, ARCHIVE_COLLECTION).find(query, projection).sort(HISTORY_SORT).limit(limit).to_list(length=limit)
+        )
+        if not archived_docs:
+            return content_docs
+        
+        merged = sorted(
+            content_docs + archived_docs,
+            key=lambda doc: (doc["request_timestamp"], doc["_id"]),
+            reverse=True
+        )
+        return merged[:limit]
 
     def _prepare_content_response(self, content_doc: dict) -> dict:
         """Prepare content document for response by converting ObjectId to string."""
-        response_doc = content_doc.copy()
+        response_doc = self._inflate_content(content_doc.copy())
         if "_id" in response_doc:
             if isinstance(response_doc["_id"], ObjectId):
                 response_doc["_id"] = str(response_doc["_id"])
@@ -22,6 +103,28 @@ class ContentService:
                 response_doc["_id"] = str(response_doc.get("id", ""))
         return response_doc
 
+    def _deflate_metadata(self, metadata: dict) -> dict:
+        """Compress the large study guide inside generation metadata for storage."""
+        study_materials = metadata.get("study_materials")
+        if not isinstance(study_materials, dict) or "study_guide" not in study_materials:
+            return metadata
+        return {
+            **metadata,
+            "study_materials": {
+                **study_materials,
+                "study_guide": compress_text(study_materials["study_guide"])
+            }
+        }
+
+    def _inflate_content(self, content_doc: dict) -> dict:
+        """Decompress stored text fields; only called on paths that serve them."""
+        if "generated_content" in content_doc:
+            content_doc["generated_content"] = decompress_text(content_doc["generated_content"])
+        study_materials = (content_doc.get("metadata") or {}).get("study_materials")
+        if isinstance(study_materials, dict) and "study_guide" in study_materials:
+            study_materials["study_guide"] = decompress_text(study_materials["study_guide"])
+        return content_doc
+
     async def create_content_request(self, user_id: str, content_data: ContentGenerationCreate) -> ContentGenerationResponse:
         """Create a new content generation request."""
         try:
@@ -31,15 +134,18 @@ class ContentService:
                 "difficulty_level": content_data.difficulty_level,
                 "content_type": content_data.content_type,
                 "status": "pending",
+                "counted_status": "pending",
                 "generated_content": None,
                 "request_timestamp": datetime.utcnow(),
                 "completion_timestamp": None,
                 "error_message": None,
+                "partial": False,
                 "metadata": {}
             }
             
             result = await self.collection.insert_one(content_doc)
             content_doc["_id"] = result.inserted_id
+            await self.stats_service.record_created(content_doc)
             
             logger.info(f"✅ Content generation request created for user {user_id}: {content_data.topic}")
             
@@ -52,22 +158,58 @@ class ContentService:
     async def get_content_by_id(self, content_id: str) -> Optional[ContentGenerationResponse]:
         """Get content generation by ID."""
         try:
-            content_doc = await self.collection.find_one({"_id": ObjectId(content_id)})
+            content_doc = await self._reader("content.by_id").find_one({"_id": ObjectId(content_id)})
+            if content_doc is None:
+                content_doc = await self._reader("content.by_id", ARCHIVE_COLLECTION).find_one({"_id": ObjectId(content_id)})
             if content_doc:
-                return ContentGenerationResponse.from_mongo(content_doc)
+                return ContentGenerationResponse.from_mongo(self._inflate_content(content_doc), trusted=settings.fast_serialization)
             return None
         except Exception as e:
             logger.error(f"❌ Error getting content by ID {content_id}: {str(e)}")
             return None
 
-    async def get_user_content_history(self, user_id: str, limit: int = 20) -> List[ContentGenerationResponse]:
-        """Get content generation history for a user."""
+    async def get_content_access_info(self, content_id: str) -> Optional[dict]:
+        """
+        Get only the owner and status of a content generation, for cheap access checks.
+
+        Archived documents are found too and flagged with archived=True;
+        they are read-only, so write paths must refuse them.
+        """
+        try:
+            access_info = await self._reader("content.access_check").find_one(
+                {"_id": ObjectId(content_id)},
+                {"user_id": 1, "status": 1}
+            )
+            if access_info is None:
+                access_info = await self._reader("content.access_check", ARCHIVE_COLLECTION).find_one(
+                    {"_id": ObjectId(content_id)},
+                    {"user_id": 1, "status": 1}
+                )
+                if access_info is not None:
+                    access_info["archived"] = True
+            return access_info
+        except Exception as e:
+            logger.error(f"❌ Error getting access info for content {content_id}: {str(e)}")
+            return None
+
+    async def get_user_content_history(self, user_id: str, limit: int = 20,
+                                       summary: bool = False) -> List[Union[ContentGenerationResponse, ContentSummary]]:
+        """
+        Get content generation history for a user.
+        
+        With summary=True only list fields are fetched (via projection) and
+        returned as ContentSummary; full bodies come from get_content_by_id.
+        """
         try:
-            cursor = self.collection.find({"user_id": user_id}).sort("request_timestamp", -1).limit(limit)
+            projection = SUMMARY_PROJECTION if summary else None
+            content_docs = await self._find_sorted("content.history", {"user_id": user_id}, projection, limit)
             content_list = []
             
-            async for content_doc in cursor:
-                content_list.append(ContentGenerationResponse.from_mongo(content_doc))
+            for content_doc in content_docs:
+                if summary:
+                    content_list.append(ContentSummary.from_mongo(content_doc, trusted=settings.fast_serialization))
+                else:
+                    content_list.append(ContentGenerationResponse.from_mongo(self._inflate_content(content_doc), trusted=settings.fast_serialization))
             
             logger.info(f"✅ Retrieved {len(content_list)} content items for user {user_id}")
             return content_list
@@ -76,40 +218,116 @@ class ContentService:
             logger.error(f"❌ Error getting content history for user {user_id}: {str(e)}")
             return []
 
-    async def update_content_status(self, content_id: str, update_data: ContentGenerationUpdate) -> Optional[ContentGenerationResponse]:
-        """Update content generation status and content."""
+    async def get_user_content_page(self, user_id: str, limit: int = 20, cursor: Optional[str] = None,
+                                    status: Optional[str] = None,
+                                    content_type: Optional[str] = None) -> Tuple[List[ContentSummary], Optional[str]]:
+        """
+        Get one page of a user's content history, newest first.
+        
+        Pages are keyset seeks on (request_timestamp, _id) served by the
+        user_history_keyset index, so page N costs the same as page 1.
+        Returns the summaries and the cursor for the next page (None on
+        the last page). Raises ValueError for a malformed cursor.
+        """
+        query = {"user_id": user_id}
+        if status is not None:
+            query["status"] = status
+        if content_type is not None:
+            query["content_type"] = content_type
+        if cursor is not None:
+            last_timestamp, last_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"request_timestamp": {"$lt": last_timestamp}},
+                {"request_timestamp": last_timestamp, "_id": {"$lt": last_id}}
+            ]
+        
+        # Fetch one extra document to learn whether another page exists
+        content_docs = await self._find_sorted("content.history_page", query, SUMMARY_PROJECTION, limit + 1)
+        
+        next_cursor = None
+        if len(content_docs) > limit:
+            content_docs = content_docs[:limit]
+            last_doc = content_docs[-1]
+            next_cursor = encode_cursor(last_doc["request_timestamp"], last_doc["_id"])
+        
+        items = [ContentSummary.from_mongo(content_doc, trusted=settings.fast_serialization) for content_doc in content_docs]
+        logger.info(f"✅ Retrieved history page of {len(items)} items for user {user_id}")
+        return items, next_cursor
+
+    def _build_update_fields(self, update_data: ContentGenerationUpdate) -> dict:
+        """Translate a ContentGenerationUpdate into the $set fields to store."""
+        update_fields = {}
+        
+        if update_data.status is not None:
+            update_fields["status"] = update_data.status
+            
+        if update_data.generated_content is not None:
+            update_fields["generated_content"] = compress_text(update_data.generated_content)
+            update_fields["content_length"] = len(update_data.generated_content)
+            
+        if update_data.completion_timestamp is not None:
+            update_fields["completion_timestamp"] = update_data.completion_timestamp
+            
+        if update_data.error_message is not None:
+            update_fields["error_message"] = update_data.error_message
+            
+        if update_data.partial is not None:
+            update_fields["partial"] = update_data.partial
+            
+        # Only replace metadata when the caller actually supplied it; the
+        # model default would otherwise wipe it on every status change
+        if update_data.metadata is not None and "metadata" in update_data.model_fields_set:
+            update_fields["metadata"] = self._deflate_metadata(update_data.metadata)
+        
+        return update_fields
+
+    async def update_content_status(self, content_id: str, update_data: ContentGenerationUpdate,
+                                    expected_status: Optional[Union[str, Iterable[str]]] = None) -> Optional[ContentGenerationResponse]:
+        """
+        Update content generation status and content in a single round-trip.
+
+        When expected_status is given the update only applies if the document is
+        currently in one of those statuses (e.g. only pending -> processing), so
+        concurrent writers cannot clobber each other's transitions. Returns the
+        updated document, or None if it does not exist or the guard did not match.
+        """
         try:
-            update_fields = {}
-            
-            if update_data.status is not None:
-                update_fields["status"] = update_data.status
-                
-            if update_data.generated_content is not None:
-                update_fields["generated_content"] = update_data.generated_content
-                
-            if update_data.completion_timestamp is not None:
-                update_fields["completion_timestamp"] = update_data.completion_timestamp
-                
-            if update_data.error_message is not None:
-                update_fields["error_message"] = update_data.error_message
-                
-            if update_data.metadata is not None:
-                update_fields["metadata"] = update_data.metadata
+            update_fields = self._build_update_fields(update_data)
 
             if not update_fields:
-                return None
+                return await self.get_content_by_id(content_id)
 
             update_fields["updated_at"] = datetime.utcnow()
+            allowed = _as_status_list(expected_status)
             
-            result = await self.collection.update_one(
-                {"_id": ObjectId(content_id)},
-                {"$set": update_fields}
+            query = {"_id": ObjectId(content_id)}
+            if allowed is not None:
+                query["status"] = {"$in": allowed}
+            
+            # Swap counted_status along with status; the previous value tells
+            # the counters which status this document is moving out of
+            stored_fields = dict(update_fields)
+            if "status" in update_fields:
+                stored_fields["counted_status"] = update_fields["status"]
+            before = await self.collection.find_one_and_update(
+                query,
+                {"$set": stored_fields},
+                return_document=ReturnDocument.BEFORE
             )
             
-            if result.modified_count:
-                logger.info(f"✅ Content {content_id} updated successfully")
-                return await self.get_content_by_id(content_id)
-            return None
+            if not before:
+                if allowed is not None:
+                    logger.warning(f"⚠️ Content {content_id} not updated: not found or status not in {query['status']['$in']}")
+                return None
+            
+            content_doc = {**before, **stored_fields}
+            if "status" in update_fields:
+                await self.stats_service.record_transition(before, update_fields["status"])
+            
+            logger.info(f"✅ Content {content_id} updated successfully")
+            if content_doc.get("status") in TERMINAL_STATUSES and "status" in update_fields:
+                job_manager.notify_completion(content_id, content_doc["status"])
+            return ContentGenerationResponse.from_mongo(self._inflate_content(content_doc), trusted=settings.fast_serialization)
             
         except Exception as e:
             logger.error(f"❌ Error updating content {content_id}: {str(e)}")
@@ -146,10 +364,29 @@ class ContentService:
             logger.error(f"❌ Error marking content {content_id} as failed: {str(e)}")
             return None
 
+    async def mark_content_cancelled(self, content_id: str) -> Optional[ContentGenerationResponse]:
+        """Mark content generation as cancelled by the user."""
+        try:
+            update_data = ContentGenerationUpdate(
+                status="cancelled",
+                error_message="Generation cancelled by user",
+                completion_timestamp=datetime.utcnow()
+            )
+            
+            return await self.update_content_status(
+                content_id,
+                update_data,
+                expected_status=ACTIVE_STATUSES
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Error marking content {content_id} as cancelled: {str(e)}")
+            return None
+
     async def get_pending_content_requests(self, limit: int = 10) -> List[ContentGenerationResponse]:
         """Get pending content generation requests for processing."""
         try:
-            cursor = self.collection.find({"status": "pending"}).sort("request_timestamp", 1).limit(limit)
+            cursor = self.collection.find(PENDING_QUERY).sort(PENDING_SORT).limit(limit)
             content_list = []
             
             async for content_doc in cursor:
@@ -163,16 +400,39 @@ class ContentService:
             logger.error(f"❌ Error getting pending content requests: {str(e)}")
             return []
 
+    async def explain_queries(self, user_id: str, limit: int = 20) -> dict:
+        """
+        Run explain() on the hot-path content queries and summarize their plans.
+
+        Covers the history listing (full and summary projections, on the
+        collection its read route uses) and the pending job queue.
+        """
+        history_query = {"user_id": user_id}
+        cursors = {
+            "history": self._reader("content.history").find(history_query).sort(HISTORY_SORT),
+            "history_summary": self._reader("content.history").find(history_query, SUMMARY_PROJECTION).sort(HISTORY_SORT),
+            "pending_jobs": self.collection.find(PENDING_QUERY).sort(PENDING_SORT),
+        }
+        explained = {}
+        for name, cursor in cursors.items():
+            explained[name] = summarize_explain(await cursor.limit(limit).explain())
+        
+        logger.info(f"🔍 Explained content queries for user {user_id}")
+        return explained
+
     async def delete_content(self, content_id: str, user_id: str) -> bool:
         """Delete content generation (only by the user who created it)."""
         try:
-            result = await self.collection.delete_one({
-                "_id": ObjectId(content_id),
-                "user_id": user_id
-            })
+            query = {"_id": ObjectId(content_id), "user_id": user_id}
+            projection = {"user_id": 1, "counted_status": 1, "content_type": 1, "difficulty_level": 1}
+            deleted = await self.collection.find_one_and_delete(query, projection=projection)
+            if not deleted:
+                deleted = await self.archive_collection.find_one_and_delete(query, projection=projection)
             
-            if result.deleted_count:
+            if deleted:
+                await self.stats_service.record_deleted(deleted)
                 logger.info(f"✅ Content {content_id} deleted by user {user_id}")
+                job_manager.notify_completion(content_id, "deleted")
                 return True
             return False
             
@@ -0,0 +1,134 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from app.config import settings
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Statuses of a content generation that is queued or being worked on
+ACTIVE_STATUSES = ("pending", "processing")
+
+# Statuses after which a content generation will not change on its own
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+class JobManager:
+    """In-process coordination for background content generation jobs."""
+
+    def __init__(self, max_concurrent_jobs: int = settings.max_concurrent_generations):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running: Set[str] = set()
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+
+    def submit(self, job_id: str, func: Callable[..., Awaitable[Any]], **kwargs) -> asyncio.Task:
+        """
+        Run a generation job in the background, bounded by the concurrency limit.
+
+        job_id is the content ID the job works on. Any job already running for
+        it is cancelled first, so a regeneration replaces rather than races
+        the previous attempt.
+        """
+        self.cancel(job_id)
+        task = asyncio.create_task(self._run(job_id, func, kwargs))
+        self._tasks[job_id] = task
+        return task
+
+    async def _run(self, content_id: str, func: Callable[..., Awaitable[Any]], kwargs: dict) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        try:
+            async with self._semaphore:
+                self._running.add(content_id)
+                try:
+                    return await func(**kwargs)
+                finally:
+                    self._running.discard(content_id)
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Generation job for content {content_id} cancelled")
+            raise
+        finally:
+            if self._tasks.get(content_id) is asyncio.current_task():
+                self._tasks.pop(content_id, None)
+
+    def cancel(self, content_id: str) -> bool:
+        """
+        Cancel the job for content_id, if any.
+
+        Cancellation propagates into in-flight upstream calls and releases the
+        job's concurrency slot as soon as the task unwinds.
+        """
+        task = self._tasks.pop(content_id, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def is_active(self, content_id: str) -> bool:
+        """Check whether a job is queued or running for content_id."""
+        task = self._tasks.get(content_id)
+        return task is not None and not task.done()
+
+    async def shutdown(self) -> None:
+        """Cancel all outstanding jobs and wait for them to unwind."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"🛑 Cancelled {len(tasks)} outstanding generation job(s)")
+        self._tasks.clear()
+
+    def notify_completion(self, content_id: str, status: str) -> None:
+        """Wake every request waiting on a content generation to finish."""
+        waiters = self._waiters.pop(content_id, None)
+        if not waiters:
+            return
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(status)
+
+        logger.info(f"🔔 Notified {len(waiters)} waiter(s) that content {content_id} is {status}")
+
+    def register_waiter(self, content_id: str) -> asyncio.Future:
+        """
+        Register a future that resolves when content_id completes.
+
+        Register before re-reading the document so a completion that lands
+        in between is not missed.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(content_id, set()).add(waiter)
+        return waiter
+
+    async def wait(self, waiter: asyncio.Future, timeout: float) -> Optional[str]:
+        """Await a registered waiter, returning None if the timeout passes first."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def discard_waiter(self, content_id: str, waiter: asyncio.Future) -> None:
+        """Unregister a waiter; safe to call after it has been notified."""
+        waiters = self._waiters.get(content_id)
+        if waiters is None:
+            return
+        waiters.discard(waiter)
+        if not waiters:
+            self._waiters.pop(content_id, None)
+        if not waiter.done():
+            waiter.cancel()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get current job and waiter counts."""
+        active = sum(1 for task in self._tasks.values() if not task.done())
+        return {
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "running_jobs": len(self._running),
+            "queued_jobs": active - len(self._running),
+            "waiting_requests": sum(len(w) for w in self._waiters.values()),
+            "watched_content": len(self._waiters),
+        }
+
+job_manager = JobManager()
@@ -0,0 +1,73 @@
+from typing import Optional
+from app.config import settings
+from app.utils.rate_limit import RateLimitBackend, MemoryRateLimitBackend, MongoRateLimitBackend, SlidingWindowLimiter
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LoginThrottle:
+    """
+    Sliding-window limits on login attempts per client IP and per email.
+
+    Registrations count against the same per-IP limit.
+
+    Checked before any password work, so a credential-stuffing burst is
+    turned away without spending bcrypt time on it. LOGIN_THROTTLE_BACKEND
+    picks per-process counters ("memory") or counters shared by every node
+    ("mongo"); any RateLimitBackend can be passed in instead.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        if backend is None:
+            backend = MongoRateLimitBackend() if settings.login_throttle_backend == "mongo" else MemoryRateLimitBackend()
+        self.backend = backend
+        self.by_ip = SlidingWindowLimiter(
+            "login_ip", settings.login_max_attempts_per_ip, settings.login_ip_window_seconds, backend
+        )
+        self.by_email = SlidingWindowLimiter(
+            "login_email", settings.login_max_attempts_per_email, settings.login_email_window_seconds, backend
+        )
+
+    async def check(self, email: str, client_ip: Optional[str]) -> Optional[float]:
+        """
+        Count a login attempt; returns None if it may proceed, else seconds to wait.
+
+        An attempt blocked by the IP limit does not count against the email.
+        """
+        if client_ip:
+            allowed, retry_after = await self.by_ip.hit(client_ip)
+            if not allowed:
+                logger.warning(f"🚦 Login throttled for IP {client_ip}")
+                return retry_after
+
+        allowed, retry_after = await self.by_email.hit(email.lower())
+        if not allowed:
+            logger.warning(f"🚦 Login throttled for {email}")
+            return retry_after
+        return None
+
+    async def check_registration(self, client_ip: Optional[str]) -> Optional[float]:
+        """
+        Count a registration against the client IP's login budget.
+
+        Each registration costs a bcrypt hash, so signups share the per-IP
+        limit with logins. Returns None if it may proceed, else seconds to wait.
+        """
+        if not client_ip:
+            return None
+        allowed, retry_after = await self.by_ip.hit(client_ip)
+        if not allowed:
+            logger.warning(f"🚦 Registration throttled for IP {client_ip}")
+            return retry_after
+        return None
+
+    async def record_success(self, email: str) -> None:
+        """Clear the email's attempt count after a successful login."""
+        await self.by_email.reset(email.lower())
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "by_ip": self.by_ip.get_stats(),
+            "by_email": self.by_email.get_stats(),
+        }
@@ -0,0 +1,163 @@
+from typing import Dict, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.utils.database import get_collection
+from app.utils.security import to_timestamp
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+REVOCATIONS_COLLECTION = "auth_revocations"
+
+# Incremental refreshes re-read this far back so clock skew between nodes
+# writing updated_at cannot hide a revocation; re-applying one is harmless
+_SYNC_OVERLAP = timedelta(seconds=30)
+
+class RevocationService:
+    """
+    Compact list of users whose tokens must no longer be trusted.
+
+    auth_revocations holds one document per affected user: either
+    deactivated, or revoked_before (tokens issued before that instant, to
+    the millisecond, are rejected). Revocations expire once every token they cover has
+    expired, so the list stays small. Deactivations never expire; reactivating
+    a user turns the entry into a revocation of the tokens issued so far. The list is cached in memory and
+    refreshed every AUTH_REVOCATION_REFRESH_SECONDS, which bounds how long
+    a revocation made on another node takes to apply here.
+    """
+
+    def __init__(self):
+        self.collection = get_collection(REVOCATIONS_COLLECTION)
+        # user id -> (deactivated, revoked_before as epoch seconds)
+        self._entries: Dict[str, Tuple[bool, float]] = {}
+        self._synced_until: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"refreshes": 0, "failed_refreshes": 0, "rejected_tokens": 0}
+
+    def _apply(self, revocation_doc: dict) -> None:
+        revoked_before = revocation_doc.get("revoked_before")
+        self._entries[str(revocation_doc["_id"])] = (
+            bool(revocation_doc.get("deactivated")),
+            to_timestamp(revoked_before) if revoked_before else 0
+        )
+
+    def _prune(self) -> None:
+        """Forget revocations older than the token lifetime; no live token predates them."""
+        horizon = int(time.time()) - settings.jwt_expires_minutes * 60
+        for user_id in [user_id for user_id, (deactivated, revoked_before) in self._entries.items()
+                        if not deactivated and revoked_before < horizon]:
+            del self._entries[user_id]
+
+    async def refresh(self) -> int:
+        """Load revocations changed since the last refresh; returns how many were applied."""
+        query = {}
+        if self._synced_until is not None:
+            query["updated_at"] = {"$gt": self._synced_until - _SYNC_OVERLAP}
+
+        applied = 0
+        async for revocation_doc in self.collection.find(query).sort("updated_at", 1):
+            self._apply(revocation_doc)
+            self._synced_until = max(self._synced_until or revocation_doc["updated_at"], revocation_doc["updated_at"])
+            applied += 1
+
+        self._prune()
+        self._stats["refreshes"] += 1
+        return applied
+
+    async def _record(self, query: dict, fields: dict) -> None:
+        revocation_doc = await self.collection.find_one_and_update(
+            query,
+            {"$set": {**fields, "updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        # Apply locally right away; other nodes pick it up on their next refresh
+        self._apply(revocation_doc)
+
+    async def revoke_tokens(self, user_id: str) -> None:
+        """Reject every token issued to the user up to now."""
+        now = datetime.utcnow()
+        try:
+            # A deactivation entry already covers every token and must not expire
+            await self._record({"_id": user_id, "deactivated": {"$ne": True}}, {
+                "revoked_before": now,
+                "expires_at": now + timedelta(minutes=settings.jwt_expires_minutes)
+            })
+        except DuplicateKeyError:
+            return
+        logger.info(f"🔒 Tokens revoked for user {user_id}")
+
+    async def mark_deactivated(self, user_id: str) -> None:
+        """Reject every token of a deactivated user, whenever it was issued."""
+        await self._record({"_id": user_id}, {"deactivated": True, "expires_at": None})
+        logger.info(f"🔒 User {user_id} added to the deactivation list")
+
+    async def clear_deactivation(self, user_id: str) -> None:
+        """
+        Lift a deactivation: new tokens are accepted again, older ones stay rejected.
+
+        The entry is updated rather than deleted so other nodes see the change
+        on their next incremental refresh; it then expires like any revocation.
+        """
+        now = datetime.utcnow()
+        await self._record({"_id": user_id}, {
+            "deactivated": False,
+            "revoked_before": now,
+            "expires_at": now + timedelta(minutes=settings.jwt_expires_minutes)
+        })
+        logger.info(f"🔓 User {user_id} removed from the deactivation list")
+
+    def is_revoked(self, user_id: str, issued_at: Optional[Union[int, float]]) -> bool:
+        """Check a token's subject and iat claim against the cached list; no database access."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False
+        deactivated, revoked_before = entry
+        # Tokens issued before iat was added to the claims count as issued at 0.
+        # Strictly before: a token stamped in the same millisecond as the
+        # revocation counts as issued after it, like the one the revoking
+        # request hands back
+        revoked = deactivated or (issued_at or 0) < revoked_before
+        if revoked:
+            self._stats["rejected_tokens"] += 1
+        return revoked
+
+    def get_stats(self) -> dict:
+        """Get refresh and rejection counters plus the size of the cached list."""
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "synced_until": self._synced_until,
+            "refresh_seconds": settings.auth_revocation_refresh_seconds,
+        }
+
+    async def _refresh_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the last known list
+                self._stats["failed_refreshes"] += 1
+                logger.error(f"❌ Failed to refresh the revocation list: {str(e)}")
+
+    def start(self) -> None:
+        """Start periodic refreshes; call after the initial refresh()."""
+        if settings.auth_revocation_refresh_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_periodically(settings.auth_revocation_refresh_seconds))
+
+    async def stop(self) -> None:
+        """Cancel the periodic refresh task."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
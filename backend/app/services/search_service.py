@@ -0,0 +1,214 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReplaceOne
+from pymongo.errors import OperationFailure
+from app.config import settings
+from app.models.content import ContentSearchResult
+from app.services.archive_service import ARCHIVE_COLLECTION
+from app.services.artifact_service import ArtifactService
+from app.utils.database import get_collection, get_read_collection
+from app.utils.compression import decompress_text
+from app.utils.cache import TTLCache
+from app.utils.search_index import InvertedIndex, make_snippet
+import logging
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLLECTION = "content_search"
+
+# Fields list rows need besides the score and the body the snippet is cut from
+_RESULT_FIELDS = ("topic", "content_type", "difficulty_level", "request_timestamp", "body")
+
+# Errors meaning the server will never serve $text here (IndexNotFound: "text
+# index required for $text query"); any other failure only skips one request
+_TEXT_INDEX_MISSING_CODES = (27,)
+
+class SearchService:
+    """
+    Per-user full-text search over generated content.
+
+    content_search holds one plain-text document per completed content
+    generation (topic, body, key concepts), since the stored bodies in
+    content_generations may be compressed. Queries use the Mongo text index;
+    with SEARCH_BACKEND=memory, or once the server reports the text index
+    missing, a per-user in-memory inverted index built from content_search
+    is used instead. Other $text failures fall back for that request only.
+    A loaded index is rebuilt after SEARCH_MEMORY_TTL_SECONDS so writes made
+    by other workers show up.
+    """
+
+    def __init__(self, artifact_service: Optional[ArtifactService] = None):
+        self.collection = get_collection(SEARCH_COLLECTION)
+        self.reader = get_read_collection(SEARCH_COLLECTION, "content.search")
+        self.content_collection = get_collection("content_generations")
+        self.use_text_index = settings.search_backend != "memory"
+        self.artifact_service = artifact_service or ArtifactService()
+        self._user_indexes: TTLCache[InvertedIndex] = TTLCache(settings.search_memory_max_users, settings.search_memory_ttl_seconds)
+
+    def _search_doc(self, content_id: str, user_id: str, topic: str, content_type: str,
+                    difficulty_level: str, request_timestamp: datetime, body: str,
+                    key_concepts: List[str]) -> dict:
+        return {
+            "_id": ObjectId(content_id),
+            "user_id": user_id,
+            "topic": topic,
+            "content_type": content_type,
+            "difficulty_level": difficulty_level,
+            "request_timestamp": request_timestamp,
+            "body": (body or "")[:settings.search_body_max_chars],
+            "key_concepts": [str(concept) for concept in key_concepts or []],
+        }
+
+    async def index_content(self, content_id: str, body: str, key_concepts: Optional[List[str]] = None) -> bool:
+        """Make a completed content generation searchable, replacing any earlier version."""
+        try:
+            content_doc = await self.content_collection.find_one(
+                {"_id": ObjectId(content_id)},
+                {"user_id": 1, "topic": 1, "content_type": 1, "difficulty_level": 1, "request_timestamp": 1}
+            )
+            if not content_doc:
+                return False
+
+            search_doc = self._search_doc(
+                content_id, content_doc["user_id"], content_doc["topic"], content_doc["content_type"],
+                content_doc["difficulty_level"], content_doc["request_timestamp"], body, key_concepts
+            )
+            await self.collection.replace_one({"_id": search_doc["_id"]}, search_doc, upsert=True)
+
+            user_index = self._user_indexes.get(search_doc["user_id"])
+            if user_index is not None:
+                self._add_to_index(user_index, search_doc)
+
+            logger.info(f"🔎 Indexed content {content_id} for search")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Error indexing content {content_id} for search: {str(e)}")
+            return False
+
+    async def remove_content(self, content_id: str, user_id: str) -> None:
+        """Drop a content generation from search."""
+        try:
+            await self.collection.delete_one({"_id": ObjectId(content_id), "user_id": user_id})
+            user_index = self._user_indexes.get(user_id)
+            if user_index is not None:
+                user_index.remove(content_id)
+        except Exception as e:
+            logger.error(f"❌ Error removing content {content_id} from search: {str(e)}")
+
+    def _add_to_index(self, user_index: InvertedIndex, search_doc: dict) -> None:
+        user_index.add(
+            str(search_doc["_id"]),
+            {
+                "topic": search_doc.get("topic", ""),
+                "key_concepts": " ".join(search_doc.get("key_concepts", [])),
+                "body": search_doc.get("body", ""),
+            },
+            {field: search_doc.get(field) for field in _RESULT_FIELDS}
+        )
+
+    async def _get_user_index(self, user_id: str) -> InvertedIndex:
+        """Load (or reuse, until it expires) the in-memory index of one user's search documents."""
+        user_index = self._user_indexes.get(user_id)
+        if user_index is not None:
+            return user_index
+
+        user_index = InvertedIndex()
+        async for search_doc in self.reader.find({"user_id": user_id}):
+            self._add_to_index(user_index, search_doc)
+
+        self._user_indexes.set(user_id, user_index)
+        return user_index
+
+    def _to_result(self, content_id: str, score: float, doc: dict, query: str) -> ContentSearchResult:
+        return ContentSearchResult(
+            _id=content_id,
+            topic=doc["topic"],
+            content_type=doc["content_type"],
+            difficulty_level=doc["difficulty_level"],
+            request_timestamp=doc["request_timestamp"],
+            score=round(score, 4),
+            snippet=make_snippet(doc.get("body", ""), query)
+        )
+
+    async def _search_text_index(self, user_id: str, query: str, limit: int,
+                                 offset: int) -> List[ContentSearchResult]:
+        projection = {field: 1 for field in _RESULT_FIELDS}
+        projection["score"] = {"$meta": "textScore"}
+        cursor = self.reader.find(
+            {"user_id": user_id, "$text": {"$search": query}},
+            projection
+        ).sort([("score", {"$meta": "textScore"})]).skip(offset).limit(limit)
+        return [
+            self._to_result(str(doc["_id"]), doc["score"], doc, query)
+            async for doc in cursor
+        ]
+
+    async def _search_memory_index(self, user_id: str, query: str, limit: int,
+                                   offset: int) -> List[ContentSearchResult]:
+        user_index = await self._get_user_index(user_id)
+        return [
+            self._to_result(content_id, score, user_index.get(content_id), query)
+            for content_id, score in user_index.search(query)[offset:offset + limit]
+        ]
+
+    async def search(self, user_id: str, query: str, limit: int = 20,
+                     offset: int = 0) -> Tuple[List[ContentSearchResult], Optional[int]]:
+        """
+        Search one user's content, best match first.
+
+        Returns the results and the offset of the next page (None on the
+        last page).
+        """
+        results = None
+        if self.use_text_index:
+            try:
+                # Fetch one extra result to learn whether another page exists
+                results = await self._search_text_index(user_id, query, limit + 1, offset)
+            except OperationFailure as e:
+                if e.code in _TEXT_INDEX_MISSING_CODES:
+                    logger.warning(f"⚠️ Mongo text index missing, using in-memory index from now on: {str(e)}")
+                    self.use_text_index = False
+                else:
+                    # Timeouts, failovers etc.: fall back for this request only
+                    logger.warning(f"⚠️ Mongo text search failed, using in-memory index for this request: {str(e)}")
+
+        if results is None:
+            results = await self._search_memory_index(user_id, query, limit + 1, offset)
+
+        next_offset = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_offset = offset + limit
+
+        logger.info(f"🔎 Search for user {user_id} returned {len(results)} results")
+        return results, next_offset
+
+    async def reindex_all(self, batch_size: int = 500) -> int:
+        """Rebuild content_search from completed content, including archived content."""
+        indexed = 0
+        for collection_name in ("content_generations", ARCHIVE_COLLECTION):
+            operations = []
+            cursor = get_collection(collection_name).find({"status": "completed"}).batch_size(batch_size)
+            async for content_doc in cursor:
+                content_id = str(content_doc["_id"])
+                key_concepts = await self.artifact_service.get_artifact(content_id, "key_concepts")
+                search_doc = self._search_doc(
+                    content_id, content_doc["user_id"], content_doc["topic"], content_doc["content_type"],
+                    content_doc["difficulty_level"], content_doc["request_timestamp"],
+                    decompress_text(content_doc.get("generated_content")) or "",
+                    key_concepts if isinstance(key_concepts, list) else []
+                )
+                operations.append(ReplaceOne({"_id": search_doc["_id"]}, search_doc, upsert=True))
+                if len(operations) >= batch_size:
+                    await self.collection.bulk_write(operations, ordered=False)
+                    indexed += len(operations)
+                    operations = []
+            if operations:
+                await self.collection.bulk_write(operations, ordered=False)
+                indexed += len(operations)
+
+        self._user_indexes.clear()
+        logger.info(f"🔎 Reindexed {indexed} content generations for search")
+        return indexed
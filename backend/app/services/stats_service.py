@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from pymongo import ReplaceOne
+from app.config import settings
+from app.models.content import UserContentStats
+from app.services.archive_service import ARCHIVE_COLLECTION
+from app.utils.database import get_collection, get_read_collection
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION = "user_stats"
+
+def _counter_key(value: Optional[str]) -> str:
+    """Make a free-form value safe to use as a field name in a $inc path."""
+    return str(value or "unknown").replace(".", "_").replace("$", "_")
+
+class StatsService:
+    """
+    Per-user content counters kept in user_stats, one document per user.
+
+    Counters move with $inc as content is created, changes status or is
+    deleted, so reading them is a single _id lookup. Each content document
+    records the status its counters reflect in counted_status; whoever
+    atomically replaces counted_status applies that transition, so every
+    transition is counted exactly once even when writers race. Documents
+    without counted_status (written before counters existed) are not in
+    the counters until their next transition or a reconciliation.
+    """
+
+    def __init__(self):
+        self.collection = get_collection(STATS_COLLECTION)
+        self.reader = get_read_collection(STATS_COLLECTION, "content.stats")
+        self.content_collection = get_collection("content_generations")
+        self._task: Optional[asyncio.Task] = None
+
+    async def _inc(self, user_id: str, increments: Dict[str, int]) -> None:
+        try:
+            await self.collection.update_one(
+                {"_id": user_id},
+                {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            # Counters drift until the next reconciliation; never fail the caller's write
+            logger.error(f"❌ Error updating content stats for user {user_id}: {str(e)}")
+
+    def _document_increments(self, content_doc: dict, status: Optional[str], step: int) -> Dict[str, int]:
+        return {
+            "total": step,
+            f"by_status.{_counter_key(status)}": step,
+            f"by_content_type.{_counter_key(content_doc.get('content_type'))}": step,
+            f"by_difficulty.{_counter_key(content_doc.get('difficulty_level'))}": step,
+        }
+
+    async def record_created(self, content_doc: dict) -> None:
+        """Count a new content document under its current status."""
+        await self._inc(content_doc["user_id"], self._document_increments(content_doc, content_doc["status"], 1))
+
+    async def record_deleted(self, content_doc: dict) -> None:
+        """Uncount a deleted content document (needs user_id, counted_status, content_type, difficulty_level)."""
+        if "counted_status" not in content_doc:
+            return
+        await self._inc(content_doc["user_id"], self._document_increments(content_doc, content_doc["counted_status"], -1))
+
+    async def record_transition(self, before: dict, new_status: str) -> None:
+        """
+        Move a document's count from the status it was counted under to new_status.
+
+        before is the document as it was when counted_status was swapped; a
+        document that was never counted is counted now instead.
+        """
+        if "counted_status" not in before:
+            await self._inc(before["user_id"], self._document_increments(before, new_status, 1))
+            return
+        old_status = before["counted_status"]
+        if old_status == new_status:
+            return
+        await self._inc(before["user_id"], {
+            f"by_status.{_counter_key(old_status)}": -1,
+            f"by_status.{_counter_key(new_status)}": 1,
+        })
+
+    async def get_user_stats(self, user_id: str) -> UserContentStats:
+        """Get a user's counters; users with no content get zeros."""
+        stats_doc = await self.reader.find_one({"_id": user_id})
+        if not stats_doc:
+            return UserContentStats()
+        return UserContentStats.from_mongo(stats_doc)
+
+    async def reconcile(self) -> int:
+        """
+        Rebuild every user's counters from the content itself (hot and archived).
+
+        counted_status is reset to status first so incremental updates carry
+        on from the rebuilt baseline. Increments that land while this runs
+        can be lost; run it when drift is suspected or on a quiet schedule.
+        Returns the number of users written.
+        """
+        stats: Dict[str, dict] = {}
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {
+                        "user_id": "$user_id",
+                        "status": "$status",
+                        "content_type": "$content_type",
+                        "difficulty_level": "$difficulty_level"
+                    },
+                    "count": {"$sum": 1}
+                }
+            }
+        ]
+
+        for collection_name in ("content_generations", ARCHIVE_COLLECTION):
+            collection = get_collection(collection_name)
+            await collection.update_many({}, [{"$set": {"counted_status": "$status"}}])
+            async for group in collection.aggregate(pipeline):
+                key = group["_id"]
+                count = group["count"]
+                user_stats = stats.setdefault(key["user_id"], {
+                    "total": 0, "by_status": {}, "by_content_type": {}, "by_difficulty": {}
+                })
+                user_stats["total"] += count
+                for field, value in (("by_status", key.get("status")),
+                                     ("by_content_type", key.get("content_type")),
+                                     ("by_difficulty", key.get("difficulty_level"))):
+                    counter = _counter_key(value)
+                    user_stats[field][counter] = user_stats[field].get(counter, 0) + count
+
+        now = datetime.utcnow()
+        operations: List[ReplaceOne] = [
+            ReplaceOne({"_id": user_id}, {"_id": user_id, **user_stats, "updated_at": now}, upsert=True)
+            for user_id, user_stats in stats.items()
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        await self.collection.delete_many({"_id": {"$nin": list(stats)}})
+
+        logger.info(f"📊 Reconciled content stats for {len(stats)} users")
+        return len(stats)
+
+    async def _run_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"❌ Content stats reconciliation failed: {str(e)}")
+
+    def start(self) -> None:
+        """Start periodic reconciliation if STATS_RECONCILE_INTERVAL_HOURS is set."""
+        if settings.stats_reconcile_interval_hours <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_periodically(settings.stats_reconcile_interval_hours * 3600))
+            logger.info(f"📊 Content stats reconciliation scheduled every {settings.stats_reconcile_interval_hours}h")
+
+    async def stop(self) -> None:
+        """Cancel the periodic reconciliation task."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -1,16 +1,32 @@
-from typing import Optional
+from typing import Any, Callable, List, Optional
 from datetime import datetime
 from app.models.user import UserCreate, UserInDB, UserResponse
 from app.utils.database import get_collection
-from app.utils.security import get_password_hash, verify_password, create_access_token
+from app.utils.security import password_hasher, create_access_token
+from app.utils.password_hashing import PasswordHashingBusy
+from app.utils.serialization import construct_trusted
+from app.utils.cache import TTLCache
+from app.services.revocation_service import RevocationService
+from app.config import settings
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import asyncio
+import inspect
 import logging
 
 logger = logging.getLogger(__name__)
 
 class UserService:
-    def __init__(self):
+    def __init__(self, revocation_service: Optional[RevocationService] = None):
         self.collection = get_collection("users")
+        self.revocation_service = revocation_service
+        # Authenticated users by id, so get_current_user is not a DB read per request
+        self.user_cache: TTLCache[UserResponse] = TTLCache(settings.user_cache_max_size, settings.user_cache_ttl_seconds)
+        # Called with the user id whenever this node invalidates a cached user,
+        # e.g. to publish the invalidation to other nodes
+        self.invalidation_hooks: List[Callable[[str], Any]] = []
+        self._watch_task: Optional[asyncio.Task] = None
 
     def _prepare_user_response(self, user_doc: dict) -> dict:
         """Prepare user document for UserResponse by converting ObjectId to string."""
@@ -19,28 +35,38 @@ class UserService:
             response_doc["_id"] = str(response_doc["_id"])
         return response_doc
 
+    def _trusted_user_response(self, user_doc: dict) -> UserResponse:
+        """Build a UserResponse from a stored user document, skipping validation when enabled."""
+        response_doc = self._prepare_user_response(user_doc)
+        if settings.fast_serialization:
+            return construct_trusted(UserResponse, response_doc)
+        return UserResponse(**response_doc)
+
+    async def _new_user_doc(self, user: UserCreate) -> dict:
+        now = datetime.utcnow()
+        return {
+            "email": user.email.lower(),
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "hashed_password": await password_hasher.hash(user.password),
+            "created_at": now,
+            "updated_at": now,
+            "is_active": True,
+            "avatar": None
+        }
+
     async def create_user(self, user: UserCreate) -> UserResponse:
         """Create a new user in MongoDB Atlas."""
         try:
-            # Check if user already exists
-            existing_user = await self.collection.find_one({"email": user.email.lower()})
-            if existing_user:
+            user_doc = await self._new_user_doc(user)
+            
+            # The email_unique index rejects duplicates, so no lookup is needed
+            # first and concurrent signups for one email cannot both succeed
+            try:
+                result = await self.collection.insert_one(user_doc)
+            except DuplicateKeyError:
                 logger.warning(f"User registration failed: Email {user.email} already exists")
                 raise ValueError("User with this email already exists")
-            
-            # Create user document
-            user_doc = {
-                "email": user.email.lower(),
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "hashed_password": get_password_hash(user.password),
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-                "is_active": True,
-                "avatar": None
-            }
-            
-            result = await self.collection.insert_one(user_doc)
             user_doc["_id"] = result.inserted_id
             
             logger.info(f"✅ User created successfully: {user.email}")
@@ -53,6 +79,49 @@ class UserService:
             logger.error(f"❌ Error creating user {user.email}: {str(e)}")
             raise e
 
+    async def import_users(self, users: List[UserCreate]) -> dict:
+        """
+        Create many users (e.g. a class roster) with one unordered insert_many.
+
+        Emails that already exist, or repeat within the import, are skipped
+        and reported rather than failing the whole import. Passwords are
+        hashed in batches the size of the hashing pool so a large import
+        does not overflow its queue.
+        """
+        seen = set()
+        unique_users, duplicates = [], []
+        for user in users:
+            email = user.email.lower()
+            if email in seen:
+                duplicates.append(email)
+                continue
+            seen.add(email)
+            unique_users.append(user)
+
+        user_docs = []
+        batch_size = max(1, password_hasher.max_workers)
+        for start in range(0, len(unique_users), batch_size):
+            batch = unique_users[start:start + batch_size]
+            user_docs.extend(await asyncio.gather(*(self._new_user_doc(user) for user in batch)))
+
+        inserted = 0
+        failed = []
+        if user_docs:
+            try:
+                result = await self.collection.insert_many(user_docs, ordered=False)
+                inserted = len(result.inserted_ids)
+            except BulkWriteError as e:
+                inserted = e.details.get("nInserted", 0)
+                for error in e.details.get("writeErrors", []):
+                    email = user_docs[error["index"]]["email"]
+                    if error.get("code") == 11000:
+                        duplicates.append(email)
+                    else:
+                        failed.append({"email": email, "error": error.get("errmsg")})
+
+        logger.info(f"✅ Imported {inserted} users ({len(duplicates)} duplicates, {len(failed)} failed)")
+        return {"inserted": inserted, "duplicates": duplicates, "failed": failed}
+
     async def authenticate_user(self, email: str, password: str) -> Optional[UserResponse]:
         """Authenticate a user with email and password from MongoDB Atlas."""
         try:
@@ -61,16 +130,27 @@ class UserService:
                 logger.warning(f"Login failed: Email {email} not found")
                 return None
             
-            if not verify_password(password, user_doc["hashed_password"]):
+            valid, new_hash = await password_hasher.verify_and_update(password, user_doc["hashed_password"])
+            if not valid:
                 logger.warning(f"Login failed: Invalid password for {email}")
                 return None
             
+            if new_hash is not None:
+                # Stored hash predates the current BCRYPT_ROUNDS; upgrade it while we have the password
+                await self.collection.update_one(
+                    {"_id": user_doc["_id"], "hashed_password": user_doc["hashed_password"]},
+                    {"$set": {"hashed_password": new_hash}}
+                )
+                logger.info(f"🔁 Password rehashed with the current cost for {email}")
+            
             logger.info(f"✅ User authenticated successfully: {email}")
             
             # Prepare response document with proper ObjectId conversion
             response_doc = self._prepare_user_response(user_doc)
             return UserResponse(**response_doc)
             
+        except PasswordHashingBusy:
+            raise
         except Exception as e:
             logger.error(f"❌ Error authenticating user {email}: {str(e)}")
             return None
@@ -80,8 +160,7 @@ class UserService:
         try:
             user_doc = await self.collection.find_one({"email": email.lower()})
             if user_doc:
-                response_doc = self._prepare_user_response(user_doc)
-                return UserResponse(**response_doc)
+                return self._trusted_user_response(user_doc)
             return None
         except Exception as e:
             logger.error(f"❌ Error getting user by email {email}: {str(e)}")
@@ -92,30 +171,126 @@ class UserService:
         try:
             user_doc = await self.collection.find_one({"_id": ObjectId(user_id)})
             if user_doc:
-                response_doc = self._prepare_user_response(user_doc)
-                return UserResponse(**response_doc)
+                return self._trusted_user_response(user_doc)
         except Exception as e:
             logger.error(f"❌ Error getting user by ID {user_id}: {str(e)}")
         return None
 
+    async def get_cached_user(self, user_id: str) -> Optional[UserResponse]:
+        """
+        Get user by ID through the in-process user cache.
+
+        Entries live for USER_CACHE_TTL_SECONDS at most and are dropped when
+        this service updates or deactivates the user; changes made by other
+        nodes show up once the entry expires unless cross-node invalidation
+        is set up.
+        """
+        user = self.user_cache.get(user_id)
+        if user is not None:
+            return user
+        user = await self.get_user_by_id(user_id)
+        if user is not None:
+            self.user_cache.set(user_id, user)
+        return user
+
+    async def invalidate_cached_user(self, user_id: str, propagate: bool = True) -> None:
+        """
+        Drop a user from this node's cache.
+
+        With propagate, invalidation_hooks are called so other nodes can
+        drop it too; pass propagate=False when applying an invalidation
+        received from another node.
+        """
+        self.user_cache.invalidate(user_id)
+        if not propagate:
+            return
+        for hook in self.invalidation_hooks:
+            try:
+                result = hook(user_id)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"❌ User cache invalidation hook failed for {user_id}: {str(e)}")
+
     async def update_user(self, user_id: str, update_data: dict) -> Optional[UserResponse]:
         """Update user information in MongoDB Atlas."""
         try:
             update_data["updated_at"] = datetime.utcnow()
             
-            result = await self.collection.update_one(
+            # Single round-trip: apply the update and get the new document back
+            user_doc = await self.collection.find_one_and_update(
                 {"_id": ObjectId(user_id)},
-                {"$set": update_data}
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER
             )
             
-            if result.modified_count:
+            if user_doc:
                 logger.info(f"✅ User updated successfully: {user_id}")
-                return await self.get_user_by_id(user_id)
+                await self.invalidate_cached_user(user_id)
+                response_doc = self._prepare_user_response(user_doc)
+                return UserResponse(**response_doc)
             return None
         except Exception as e:
             logger.error(f"❌ Error updating user {user_id}: {str(e)}")
             return None
 
+    async def deactivate_user(self, user_id: str) -> Optional[UserResponse]:
+        """Deactivate a user; their tokens stop authenticating."""
+        if await self.get_user_by_id(user_id) is None:
+            return None
+        if self.revocation_service is not None:
+            # Claims-only auth never reads the user document, so list the user
+            # first: if this fails the user is still active everywhere, never
+            # inactive in users but still accepted by content routes
+            await self.revocation_service.mark_deactivated(user_id)
+        user = await self.update_user(user_id, {"is_active": False})
+        if user:
+            logger.info(f"🚫 User deactivated: {user_id}")
+        return user
+
+    async def reactivate_user(self, user_id: str) -> Optional[UserResponse]:
+        """Reactivate a user; they must log in again, tokens from before stay rejected."""
+        user = await self.update_user(user_id, {"is_active": True})
+        if user:
+            if self.revocation_service is not None:
+                await self.revocation_service.clear_deactivation(user_id)
+            logger.info(f"✅ User reactivated: {user_id}")
+        return user
+
+    async def _watch_user_changes(self) -> None:
+        """Invalidate cached users changed by any node, via a change stream on users."""
+        pipeline = [{"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}]
+        while True:
+            try:
+                async with self.collection.watch(pipeline) as stream:
+                    async for change in stream:
+                        await self.invalidate_cached_user(str(change["documentKey"]["_id"]), propagate=False)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Changes may have been missed while disconnected
+                logger.warning(f"⚠️ User change stream interrupted, clearing user cache: {str(e)}")
+                self.user_cache.clear()
+                await asyncio.sleep(5)
+
+    def start(self) -> None:
+        """Start cross-node cache invalidation if USER_CACHE_CHANGE_STREAM is on (needs a replica set)."""
+        if not settings.user_cache_change_stream or not self.user_cache.enabled:
+            return
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_user_changes())
+            logger.info("👀 Watching users for cross-node cache invalidation")
+
+    async def stop(self) -> None:
+        """Cancel the change stream watcher."""
+        if self._watch_task is not None and not self._watch_task.done():
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+        self._watch_task = None
+
     def create_user_token(self, user: UserResponse) -> str:
         """Create JWT token for user."""
         try:
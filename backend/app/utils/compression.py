@@ -0,0 +1,58 @@
+from typing import Any, Optional
+from bson.binary import Binary
+from app.config import settings
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# zstd is optional; fall back to zlib when the package is missing
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# User-defined BSON binary subtypes (0x80-0xFF) tag the codec, so a stored value
+# is self-describing and plain strings from older documents pass through untouched
+ZLIB_SUBTYPE = 0x80
+ZSTD_SUBTYPE = 0x81
+
+def compress_text(value: Optional[str], threshold: Optional[int] = None) -> Any:
+    """
+    Compress a string for storage if it is larger than the threshold.
+    
+    Returns the original string when it is small, compression is disabled
+    or compressing would not save space; otherwise a tagged BSON Binary.
+    """
+    if threshold is None:
+        threshold = settings.content_compression_threshold
+    if not isinstance(value, str) or threshold <= 0:
+        return value
+
+    raw = value.encode("utf-8")
+    if len(raw) < threshold:
+        return value
+
+    if settings.content_compression_codec == "zstd" and ZSTD_AVAILABLE:
+        compressed = Binary(zstandard.ZstdCompressor(level=3).compress(raw), ZSTD_SUBTYPE)
+    else:
+        compressed = Binary(zlib.compress(raw, 6), ZLIB_SUBTYPE)
+
+    if len(compressed) >= len(raw):
+        return value
+    return compressed
+
+def decompress_text(value: Any) -> Any:
+    """Reverse compress_text; strings and other values are returned unchanged."""
+    if not isinstance(value, Binary):
+        return value
+
+    if value.subtype == ZLIB_SUBTYPE:
+        return zlib.decompress(value).decode("utf-8")
+    if value.subtype == ZSTD_SUBTYPE:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Content is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(value).decode("utf-8")
+
+    return value
@@ -1,5 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import settings
+from app.utils.db_monitoring import PoolTelemetry, CommandTelemetry
+from app.utils.read_routing import get_read_preference
 import logging
 
 # Set up logging
@@ -9,18 +11,41 @@ logger = logging.getLogger(__name__)
 class Database:
     client: AsyncIOMotorClient = None
     db = None
+    pool_telemetry: PoolTelemetry = None
+    command_telemetry: CommandTelemetry = None
+
+def get_client_options() -> dict:
+    """Build MongoClient options from settings; empty settings keep driver/server defaults."""
+    options = {
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+        "socketTimeoutMS": settings.mongodb_socket_timeout_ms,
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "waitQueueTimeoutMS": settings.mongodb_wait_queue_timeout_ms,
+    }
+    if settings.mongodb_compressors:
+        options["compressors"] = settings.mongodb_compressors
+    if settings.mongodb_read_concern:
+        options["readConcernLevel"] = settings.mongodb_read_concern
+    if settings.mongodb_write_concern:
+        w = settings.mongodb_write_concern
+        options["w"] = int(w) if w.isdigit() else w
+    return options
 
 async def connect_to_mongo():
     """Create database connection to MongoDB Atlas."""
     try:
+        # Pool and command listeners export checkout waits, saturation and latency,
+        # and log commands slower than MONGODB_SLOW_COMMAND_MS
+        Database.pool_telemetry = PoolTelemetry(settings.mongodb_max_pool_size)
+        Database.command_telemetry = CommandTelemetry(settings.mongodb_slow_command_ms)
+        
         # Connect to MongoDB Atlas
         Database.client = AsyncIOMotorClient(
             settings.mongodb_uri,
-            serverSelectionTimeoutMS=5000,  # 5 second timeout
-            connectTimeoutMS=10000,         # 10 second connection timeout
-            socketTimeoutMS=10000,          # 10 second socket timeout
-            maxPoolSize=10,                 # Connection pool size
-            minPoolSize=1                   # Minimum connections
+            event_listeners=[Database.pool_telemetry, Database.command_telemetry],
+            **get_client_options()
         )
         
         # Test the connection
@@ -43,6 +68,17 @@ async def close_mongo_connection():
         Database.client.close()
         logger.info("🔌 Closed MongoDB connection.")
 
+def get_db_telemetry() -> dict:
+    """Get connection pool, per-command and per-collection latency telemetry."""
+    command_telemetry = Database.command_telemetry
+    return {
+        "pool": Database.pool_telemetry.get_stats() if Database.pool_telemetry else {},
+        "commands": command_telemetry.get_stats() if command_telemetry else {},
+        "operations": command_telemetry.get_operation_stats() if command_telemetry else {},
+        "slow_commands": command_telemetry.slow_commands if command_telemetry else 0,
+        "slow_command_ms": settings.mongodb_slow_command_ms,
+    }
+
 def get_database():
     """Get database instance."""
     return Database.db
@@ -50,3 +86,9 @@ def get_database():
 def get_collection(collection_name: str):
     """Get collection instance."""
     return Database.db[collection_name]
+
+def get_read_collection(collection_name: str, operation: str):
+    """Get a collection handle whose reads follow the read preference routed for operation."""
+    return get_collection(collection_name).with_options(
+        read_preference=get_read_preference(operation)
+    )
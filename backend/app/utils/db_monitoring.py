@@ -0,0 +1,290 @@
+from typing import Any, Dict, List, Tuple
+from pymongo import monitoring
+import bisect
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PoolTelemetry(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener tracking checkout wait time and pool saturation.
+
+    PyMongo emits pool events on the thread doing the checkout (Motor's
+    executor threads), so the checkout start time is kept thread-locally and
+    the shared counters are guarded by a lock.
+    """
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+        logger.warning(f"⚠️ MongoDB connection pool cleared for {event.address}")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+        logger.warning(f"⚠️ MongoDB connection checkout failed ({event.reason}) for {event.address}")
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        self._local.started = None
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def get_stats(self) -> dict:
+        """Get a snapshot of pool usage and checkout wait times."""
+        with self._lock:
+            return {
+                "max_pool_size": self.max_pool_size,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturation": round(self.checked_out / self.max_pool_size, 3) if self.max_pool_size else None,
+                "peak_saturation": round(self.peak_checked_out / self.max_pool_size, 3) if self.max_pool_size else None,
+                "checkouts": self.checkouts,
+                "avg_checkout_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_checkout_wait_ms": round(self.max_wait_ms, 3),
+                "checkout_failures": dict(self.checkout_failures),
+                "pool_clears": self.pool_clears,
+            }
+
+# Upper bounds (ms) of the command latency histogram buckets; slower commands land in the overflow bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Where each command keeps its filter (update/delete hold statements with a "q" filter)
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "update": "updates",
+    "delete": "deletes",
+}
+
+def query_shape(value: Any) -> Any:
+    """Replace every value in a filter with "?" so it can be logged without user data."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and all(isinstance(item, dict) for item in value):
+        return [query_shape(item) for item in value]
+    return "?"
+
+def command_shape(command_name: str, command: dict) -> dict:
+    """Describe a command's filter, sort and pipeline stages without their values."""
+    shape = {}
+    if command_name == "aggregate":
+        shape["pipeline"] = [
+            {stage: query_shape(spec)} if stage == "$match" else stage
+            for step in command.get("pipeline", [])
+            for stage, spec in step.items()
+        ]
+        return shape
+
+    field = _FILTER_FIELDS.get(command_name)
+    if field is None:
+        return shape
+    value = command.get(field)
+    if field in ("updates", "deletes"):
+        statements = value or []
+        value = statements[0].get("q") if statements else None
+        if len(statements) > 1:
+            shape["statements"] = len(statements)
+    if value is not None:
+        shape["filter"] = query_shape(value)
+    if isinstance(command.get("sort"), dict):
+        shape["sort"] = dict(command["sort"])
+    return shape
+
+def _command_collection(command_name: str, command: dict) -> str:
+    if command_name == "getMore":
+        return command.get("collection", "-")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else "-"
+
+class CommandTelemetry(monitoring.CommandListener):
+    """
+    Command listener recording latency per command and per collection and operation.
+
+    Each (collection, command) pair keeps a latency histogram. Commands
+    slower than slow_command_ms are logged with the shape of their filter
+    (field names and operators, values replaced by "?"); 0 disables the log.
+    """
+
+    def __init__(self, slow_command_ms: float = 0):
+        self.slow_command_ms = slow_command_ms
+        self._lock = threading.Lock()
+        self.commands: Dict[str, dict] = {}
+        self.operations: Dict[Tuple[str, str], dict] = {}
+        self.slow_commands = 0
+        self._started: Dict[Tuple[Any, int], Tuple[str, dict]] = {}
+
+    def _record(self, command_name: str, collection: str, duration_ms: float, failed: bool) -> None:
+        with self._lock:
+            stats = self.commands.setdefault(
+                command_name,
+                {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            if failed:
+                stats["failures"] += 1
+
+            operation = self.operations.setdefault(
+                (collection, command_name),
+                {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0,
+                 "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+            )
+            operation["count"] += 1
+            operation["total_ms"] += duration_ms
+            operation["max_ms"] = max(operation["max_ms"], duration_ms)
+            operation["buckets"][bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+            if failed:
+                operation["failures"] += 1
+
+    def _finish(self, event, failed: bool) -> None:
+        collection, command = self._started.pop((event.connection_id, event.request_id), ("-", None))
+        duration_ms = event.duration_micros / 1000
+        self._record(event.command_name, collection, duration_ms, failed)
+
+        if self.slow_command_ms and duration_ms >= self.slow_command_ms:
+            with self._lock:
+                self.slow_commands += 1
+            shape = command_shape(event.command_name, command) if command else {}
+            logger.warning(
+                f"🐢 Slow MongoDB command: {event.command_name} on {event.database_name}.{collection} "
+                f"took {duration_ms:.1f}ms{' (failed)' if failed else ''} {shape}"
+            )
+
+    def started(self, event):
+        # started and succeeded/failed fire on the same driver thread; keep the
+        # command so a slow one can be described once its duration is known
+        self._started[(event.connection_id, event.request_id)] = (
+            _command_collection(event.command_name, event.command),
+            event.command
+        )
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Get per-command latency figures in milliseconds."""
+        with self._lock:
+            return {
+                command_name: {
+                    "count": stats["count"],
+                    "failures": stats["failures"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 3) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max_ms"], 3),
+                }
+                for command_name, stats in self.commands.items()
+            }
+
+    def get_operation_stats(self) -> Dict[str, dict]:
+        """Get latency histograms keyed by "collection.command"."""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                f"{collection}.{command_name}": {
+                    "count": stats["count"],
+                    "failures": stats["failures"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 3) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max_ms"], 3),
+                    "histogram": dict(zip(labels, stats["buckets"])),
+                }
+                for (collection, command_name), stats in sorted(self.operations.items())
+            }
+
+def _plan_tree(stage: dict) -> dict:
+    """Keep the parts of an explain plan stage worth reading: stage, index and children."""
+    node = {"stage": stage.get("stage")}
+    for key in ("indexName", "keyPattern", "direction", "isMultiKey", "filter"):
+        if key in stage:
+            node[key] = query_shape(stage[key]) if key == "filter" else stage[key]
+    if "inputStage" in stage:
+        node["inputStage"] = _plan_tree(stage["inputStage"])
+    if "inputStages" in stage:
+        node["inputStages"] = [_plan_tree(child) for child in stage["inputStages"]]
+    return node
+
+def _plan_stages(node: dict) -> List[str]:
+    stages = [node["stage"]]
+    if "inputStage" in node:
+        stages += _plan_stages(node["inputStage"])
+    for child in node.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+def summarize_explain(explain: dict) -> dict:
+    """
+    Reduce an explain() result to the plan and the work it did.
+
+    A healthy query shows an IXSCAN and keys/docs examined close to the
+    number returned; a COLLSCAN or a SORT stage means it is missing an index.
+    """
+    planner = explain.get("queryPlanner", {})
+    winning_plan = planner.get("winningPlan", {})
+    # Servers using the slot-based engine nest the classic plan under queryPlan
+    winning_plan = winning_plan.get("queryPlan", winning_plan)
+    plan = _plan_tree(winning_plan) if winning_plan else {}
+    execution = explain.get("executionStats", {})
+    return {
+        "namespace": planner.get("namespace"),
+        "stages": _plan_stages(plan) if plan else [],
+        "rejected_plans": len(planner.get("rejectedPlans", [])),
+        "n_returned": execution.get("nReturned"),
+        "keys_examined": execution.get("totalKeysExamined"),
+        "docs_examined": execution.get("totalDocsExamined"),
+        "execution_ms": execution.get("executionTimeMillis"),
+        "winning_plan": plan,
+    }
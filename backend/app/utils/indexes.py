@@ -0,0 +1,153 @@
+from typing import Dict, List
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+from app.utils.database import get_database
+from app.utils.search_index import FIELD_WEIGHTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Declarative index registry: collection name -> indexes every query path relies on.
+# Index names are fixed so re-applying the registry at startup is a no-op.
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        # Login, registration and duplicate checks all look users up by email
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "content_generations": [
+        # History: find({"user_id": ...}).sort("request_timestamp", -1), plus the
+        # (request_timestamp, _id) keyset seeks used by cursor pagination
+        IndexModel(
+            [("user_id", ASCENDING), ("request_timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_history_keyset"
+        ),
+        # Pending queue: find({"status": "pending"}).sort("request_timestamp", 1);
+        # partial so completed documents never enter the index
+        IndexModel(
+            [("status", ASCENDING), ("request_timestamp", ASCENDING)],
+            name="pending_queue",
+            partialFilterExpression={"status": "pending"}
+        ),
+        # Archival sweep: finished documents older than the cutoff, oldest first
+        IndexModel([("request_timestamp", ASCENDING)], name="archive_sweep"),
+    ],
+    "content_search": [
+        # Per-user $text search; user_id is an equality prefix so each query
+        # only scans that user's entries. Weights match the in-memory fallback.
+        IndexModel(
+            [("user_id", ASCENDING), ("topic", TEXT), ("key_concepts", TEXT), ("body", TEXT)],
+            name="user_text_search",
+            weights=FIELD_WEIGHTS,
+            default_language="english"
+        ),
+    ],
+    "content_archive": [
+        # Cold-tier fall-through for history and cursor pagination
+        IndexModel(
+            [("user_id", ASCENDING), ("request_timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_history_keyset"
+        ),
+    ],
+    "auth_revocations": [
+        # Incremental refreshes of the in-memory revocation list
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        # Token revocations lapse once every token they cover has expired;
+        # deactivations have no expires_at and are kept
+        IndexModel([("expires_at", ASCENDING)], name="revocation_ttl", expireAfterSeconds=0),
+    ],
+    "rate_limits": [
+        # Shared login throttle counters lapse two windows after their window starts
+        IndexModel([("expires_at", ASCENDING)], name="rate_limit_ttl", expireAfterSeconds=0),
+    ],
+    "content_artifacts": [
+        # One document per (content, artifact name); also serves delete_many by content_id
+        IndexModel(
+            [("content_id", ASCENDING), ("name", ASCENDING)],
+            name="content_artifact_unique",
+            unique=True
+        ),
+    ],
+}
+
+# Indexes correctness depends on, not just speed: startup fails without them.
+# Registration relies on email_unique alone to reject duplicate emails.
+REQUIRED_INDEXES: Dict[str, List[str]] = {
+    "users": ["email_unique"],
+}
+
+# Indexes an earlier registry created that nothing queries any more. Each is
+# dropped once its replacement exists so deployments stop paying for it on writes.
+RETIRED_INDEXES: Dict[str, List[str]] = {
+    # Superseded by user_history_keyset, which adds _id for cursor pagination
+    "content_generations": ["user_history"],
+}
+
+async def _drop_retired_indexes(db, collection_name: str) -> None:
+    retired = RETIRED_INDEXES.get(collection_name)
+    if not retired:
+        return
+    try:
+        existing = await db[collection_name].index_information()
+        for name in retired:
+            if name in existing:
+                await db[collection_name].drop_index(name)
+                logger.info(f"🗑️ Dropped retired index {name} on {collection_name}")
+    except OperationFailure as e:
+        logger.error(f"❌ Failed to drop retired indexes on {collection_name}: {str(e)}")
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """
+    Apply the index registry to the connected database.
+
+    Safe to run on every startup: existing indexes with the same definition
+    are left alone, and retired indexes are dropped once the collection's
+    registry applied. A conflicting definition is logged rather than raised
+    so one bad index cannot stop the API from starting, unless the index is
+    in REQUIRED_INDEXES: then RuntimeError is raised if it does not exist.
+    """
+    db = get_database()
+    applied = {}
+
+    for collection_name, indexes in INDEX_REGISTRY.items():
+        try:
+            applied[collection_name] = await db[collection_name].create_indexes(indexes)
+            logger.info(f"🗂️ Indexes ensured on {collection_name}: {', '.join(applied[collection_name])}")
+        except OperationFailure as e:
+            logger.error(f"❌ Failed to ensure indexes on {collection_name}: {str(e)}")
+            applied[collection_name] = []
+            continue
+        await _drop_retired_indexes(db, collection_name)
+
+    for collection_name, names in REQUIRED_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        missing = [name for name in names if name not in existing]
+        if missing:
+            raise RuntimeError(
+                f"Required indexes {', '.join(missing)} on {collection_name} could not be built; "
+                f"resolve the conflict logged above (e.g. duplicate values) before starting"
+            )
+
+    return applied
+
+async def get_index_usage_stats() -> Dict[str, List[dict]]:
+    """Get per-index usage counters ($indexStats) for every registered collection."""
+    db = get_database()
+    stats = {}
+
+    for collection_name in INDEX_REGISTRY:
+        try:
+            cursor = db[collection_name].aggregate([{"$indexStats": {}}])
+            stats[collection_name] = [
+                {
+                    "name": index_stats["name"],
+                    "key": index_stats["key"],
+                    "ops": index_stats["accesses"]["ops"],
+                    "since": index_stats["accesses"]["since"],
+                }
+                async for index_stats in cursor
+            ]
+        except OperationFailure as e:
+            logger.error(f"❌ Failed to read index stats for {collection_name}: {str(e)}")
+            stats[collection_name] = []
+
+    return stats
@@ -0,0 +1,20 @@
+from typing import Tuple
+from datetime import datetime
+from bson import ObjectId
+import base64
+import json
+
+def encode_cursor(request_timestamp: datetime, content_id: str) -> str:
+    """Encode the (request_timestamp, _id) keyset position of the last item as an opaque cursor."""
+    position = {"ts": request_timestamp.isoformat(), "id": str(content_id)}
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a cursor from encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(position["ts"]), ObjectId(position["id"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
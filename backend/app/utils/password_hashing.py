@@ -0,0 +1,128 @@
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing queue is full; callers should answer 503."""
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool instead of the event loop.
+
+    bcrypt releases the GIL while hashing, so workers run in parallel and
+    the loop keeps serving other requests. At most max_workers hashes run
+    at once. Once max_queue callers are already waiting, new ones get
+    PasswordHashingBusy straight away so a login burst cannot pile up
+    unbounded work. Verification also reports a new hash when the stored
+    one uses an outdated cost, so callers can rehash on login.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_queue: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self._stats = {
+            "hashes": 0,
+            "verifications": 0,
+            "rehashes_needed": 0,
+            "rejected": 0,
+            "peak_waiting": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+        }
+
+    def _ensure_pool(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def _run(self, func, *args):
+        self._ensure_pool()
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise PasswordHashingBusy("Too many password operations in progress, retry shortly")
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        self._stats["peak_waiting"] = max(self._stats["peak_waiting"], self._waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        wait_ms = (started_at - queued_at) * 1000
+        self._stats["total_wait_ms"] += wait_ms
+        self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+        self._running += 1
+        loop = asyncio.get_running_loop()
+        slots = self._slots
+
+        def finished() -> None:
+            self._running -= 1
+            self._stats["total_run_ms"] += (time.perf_counter() - started_at) * 1000
+            slots.release()
+
+        def on_done(_) -> None:
+            # Runs on the worker thread; hand the bookkeeping back to the loop
+            try:
+                loop.call_soon_threadsafe(finished)
+            except RuntimeError:
+                pass  # Loop already closed on shutdown
+
+        # The slot is held until the thread finishes, not until the caller
+        # stops waiting: a cancelled caller leaves the hash running
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured bcrypt cost."""
+        hashed = await self._run(self.context.hash, password)
+        self._stats["hashes"] += 1
+        return hashed
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password against its hash.
+
+        Returns (valid, new_hash); new_hash is set when the password is valid
+        but the stored hash uses an outdated scheme or cost.
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        self._stats["verifications"] += 1
+        if new_hash is not None:
+            self._stats["rehashes_needed"] += 1
+        return valid, new_hash
+
+    def get_stats(self) -> dict:
+        """Get pool size, queue depth and wait/run time counters."""
+        operations = self._stats["hashes"] + self._stats["verifications"]
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "bcrypt_rounds": self.context.to_dict().get("bcrypt__rounds"),
+            "running": self._running,
+            "waiting": self._waiting,
+            **{key: value for key, value in self._stats.items() if not key.startswith("total_")},
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / operations, 3) if operations else 0.0,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 3),
+            "avg_run_ms": round(self._stats["total_run_ms"] / operations, 3) if operations else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; call on application shutdown."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
@@ -0,0 +1,153 @@
+from typing import Dict, Tuple
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pymongo import ReturnDocument
+from app.utils.database import get_collection
+import math
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBackend(ABC):
+    """
+    Storage for sliding-window counters: a count per key per fixed window.
+
+    increment adds one hit to the key's current window and returns the
+    previous and current window counts. Subclass it to share counters
+    between nodes (see MongoRateLimitBackend).
+    """
+
+    @abstractmethod
+    async def increment(self, key: str, window_seconds: float, now: float) -> Tuple[int, int]:
+        ...
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        ...
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process counters; each node enforces its own limits."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (window index, previous window count, current window count)
+        self._windows: Dict[str, Tuple[int, int, int]] = {}
+
+    def _prune(self, window: int) -> None:
+        """Drop keys with no hits in the current or previous window."""
+        for key in [key for key, (index, _, _) in self._windows.items() if index < window - 1]:
+            del self._windows[key]
+
+    async def increment(self, key: str, window_seconds: float, now: float) -> Tuple[int, int]:
+        window = int(now // window_seconds)
+        index, previous, current = self._windows.get(key, (window, 0, 0))
+        if index == window - 1:
+            previous, current = current, 0
+        elif index != window:
+            previous, current = 0, 0
+        current += 1
+        self._windows[key] = (window, previous, current)
+
+        if len(self._windows) > self.max_keys:
+            self._prune(window)
+        return previous, current
+
+    async def reset(self, key: str) -> None:
+        self._windows.pop(key, None)
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """
+    Counters shared by every node, one document per key and window in rate_limits.
+
+    Documents expire through the rate_limits TTL index two windows after
+    their window starts.
+    """
+
+    def __init__(self, collection_name: str = "rate_limits"):
+        self.collection = get_collection(collection_name)
+
+    async def increment(self, key: str, window_seconds: float, now: float) -> Tuple[int, int]:
+        window = int(now // window_seconds)
+        counter = await self.collection.find_one_and_update(
+            {"_id": f"{key}:{window}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {
+                    "expires_at": datetime.utcfromtimestamp((window + 2) * window_seconds)
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        previous = await self.collection.find_one({"_id": f"{key}:{window - 1}"}, {"count": 1})
+        return (previous or {}).get("count", 0), counter["count"]
+
+    async def reset(self, key: str) -> None:
+        # Anchored prefix match on _id, served by the _id index
+        await self.collection.delete_many({"_id": {"$regex": f"^{re.escape(key)}:"}})
+
+class SlidingWindowLimiter:
+    """
+    Allow at most limit hits per key in any window_seconds span (approximately).
+
+    Uses the sliding-window counter estimate: the previous fixed window's
+    count weighted by how much of it still overlaps the sliding window,
+    plus the current window's count. Every hit counts, including rejected
+    ones, so a client that keeps hammering stays blocked.
+    """
+
+    def __init__(self, name: str, limit: int, window_seconds: float, backend: RateLimitBackend):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.backend = backend
+        self._stats = {"allowed": 0, "rejected": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0 and self.window_seconds > 0
+
+    async def hit(self, key: str) -> Tuple[bool, float]:
+        """Record a hit for key; returns (allowed, seconds until a retry may succeed)."""
+        if not self.enabled:
+            return True, 0.0
+
+        now = time.time()
+        try:
+            previous, current = await self.backend.increment(f"{self.name}:{key}", self.window_seconds, now)
+        except Exception as e:
+            # Fail open: a counter outage must not lock everyone out
+            self._stats["errors"] += 1
+            logger.error(f"❌ Rate limit backend error for {self.name}: {str(e)}")
+            return True, 0.0
+
+        elapsed = (now % self.window_seconds) / self.window_seconds
+        estimate = previous * (1 - elapsed) + current
+        if estimate <= self.limit:
+            self._stats["allowed"] += 1
+            return True, 0.0
+
+        self._stats["rejected"] += 1
+        # Time until the previous window's weight has decayed enough, or at
+        # the latest until the current window becomes the previous one
+        retry_after = self.window_seconds - (now % self.window_seconds)
+        if previous and current <= self.limit:
+            needed = (previous * (1 - elapsed) - (self.limit - current)) / previous
+            retry_after = min(retry_after, needed * self.window_seconds)
+        return False, max(1.0, math.ceil(retry_after))
+
+    async def reset(self, key: str) -> None:
+        try:
+            await self.backend.reset(f"{self.name}:{key}")
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"❌ Rate limit backend error for {self.name}: {str(e)}")
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            "limit": self.limit,
+            "window_seconds": self.window_seconds,
+        }
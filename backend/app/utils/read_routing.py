@@ -0,0 +1,54 @@
+from typing import Dict, Optional
+from pymongo.read_preferences import (
+    Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest, _ServerMode
+)
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Read preference per named read operation. Reads that can tolerate a few
+# seconds of lag go to secondaries; anything that gates a write (ownership
+# checks) or must see the caller's own writes stays on the primary.
+# MONGODB_READ_ROUTES overrides individual entries.
+DEFAULT_READ_ROUTES: Dict[str, str] = {
+    "content.history": "secondaryPreferred",
+    "content.history_page": "secondaryPreferred",
+    "content.stats": "secondaryPreferred",
+    "content.search": "secondaryPreferred",
+    "content.by_id": "primary",
+    "content.access_check": "primary",
+}
+
+_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+def get_read_routes() -> Dict[str, str]:
+    """Get the effective operation -> read preference mode table."""
+    return {**DEFAULT_READ_ROUTES, **settings.mongodb_read_routes}
+
+def get_read_preference(operation: str, max_staleness_seconds: Optional[int] = None) -> _ServerMode:
+    """
+    Resolve the read preference for a named read operation.
+
+    Unknown operations and unknown modes fall back to the primary. Non-primary
+    modes carry maxStalenessSeconds (MongoDB requires at least 90; -1 means no
+    limit).
+    """
+    mode = get_read_routes().get(operation, "primary")
+    mode_cls = _MODES.get(mode)
+    if mode_cls is None:
+        logger.warning(f"⚠️ Unknown read preference '{mode}' for {operation}; using primary")
+        mode_cls = Primary
+
+    if mode_cls is Primary:
+        return Primary()
+
+    if max_staleness_seconds is None:
+        max_staleness_seconds = settings.mongodb_max_staleness_seconds
+    return mode_cls(max_staleness=max_staleness_seconds)
@@ -0,0 +1,194 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import zlib
+
+# brotli is optional; only gzip is offered when the package is missing
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Only text-like bodies are worth compressing; images, archives etc. already are
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+def choose_encoding(header: str, brotli_enabled: bool = True) -> Optional[str]:
+    """Pick "br" or "gzip" for a request's Accept-Encoding, or None to send identity."""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = []
+    if brotli_enabled and BROTLI_AVAILABLE:
+        candidates.append(("br", codings.get("br", wildcard)))
+    candidates.append(("gzip", codings.get("gzip", wildcard)))
+    # Highest q wins; brotli first on ties since it compresses text better
+    encoding, q = max(candidates, key=lambda candidate: candidate[1])
+    return encoding if q > 0 else None
+
+class _Compressor:
+    """Incremental gzip or brotli compressor with a common interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress a chunk; with flush, everything so far is emitted so the client can use it."""
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.flush() if flush else b"")
+        return self._zlib.compress(data) + (self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip compression for text responses.
+
+    Brotli is preferred when the client accepts it and the brotli package
+    is installed; otherwise gzip. Bodies smaller than minimum_size,
+    non-text types and responses that are already encoded are sent as is.
+    Every text response gets Accept-Encoding added to its Vary header
+    (existing values such as Origin are kept), whichever encoding was used.
+    Streamed responses are compressed chunk by chunk and flushed after
+    each one so partial output is not held back. Bodies of offload_size
+    bytes or more are compressed on a worker thread (zlib and brotli
+    release the GIL) so large history pages do not stall the event loop.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 4,
+                 brotli_quality: int = 4, brotli_enabled: bool = True,
+                 offload_size: int = 64 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_enabled = brotli_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        # Identity-only clients still go through the responder so the
+        # response carries Vary: Accept-Encoding for shared caches
+        encoding = choose_encoding(accept_encoding, self.brotli_enabled) if accept_encoding else None
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+def _with_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Add Accept-Encoding to the response's Vary values, keeping the ones already set (e.g. Origin)."""
+    values = []
+    for name, value in headers:
+        if name == b"vary":
+            values.extend(part.strip() for part in value.split(b",") if part.strip())
+    if any(value == b"*" or value.lower() == b"accept-encoding" for value in values):
+        return headers
+    headers = [(name, value) for name, value in headers if name != b"vary"]
+    headers.append((b"vary", b", ".join(values + [b"Accept-Encoding"])))
+    return headers
+
+class _CompressingResponder:
+    """Per-response state: holds back the start message until the first body chunk is seen."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[dict] = None
+        self._compressor: Optional[_Compressor] = None
+        self._passthrough = False
+
+    def _headers(self) -> List[Tuple[bytes, bytes]]:
+        return list(self._start.get("headers", []))
+
+    def _eligible(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        content_type = b""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").startswith(_COMPRESSIBLE_TYPES)
+
+    def _compressed_headers(self, headers: List[Tuple[bytes, bytes]], length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        headers = [(name, value) for name, value in _with_vary(headers) if name != b"content-length"]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        return headers
+
+    def _compress_all(self, body: bytes) -> bytes:
+        return self._compressor.compress(body, flush=False) + self._compressor.finish()
+
+    async def send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            headers = self._headers()
+            if not self._eligible(headers):
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+            if self.encoding is None or (not more_body and len(body) < self.middleware.minimum_size):
+                # Sent uncompressed, but another request could get it compressed
+                self._passthrough = True
+                await self._send({**self._start, "headers": _with_vary(headers)})
+                await self._send(message)
+                return
+
+            self._compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            if not more_body:
+                # Whole body in one message: compress it and send an exact Content-Length
+                if len(body) >= self.middleware.offload_size:
+                    compressed = await asyncio.get_running_loop().run_in_executor(None, self._compress_all, body)
+                else:
+                    compressed = self._compress_all(body)
+                await self._send({**self._start, "headers": self._compressed_headers(headers, len(compressed))})
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            await self._send({**self._start, "headers": self._compressed_headers(headers, None)})
+
+        if more_body:
+            chunk = self._compressor.compress(body, flush=True)
+        else:
+            chunk = self._compressor.compress(body, flush=False) + self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
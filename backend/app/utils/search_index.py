@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Set, Tuple
+import math
+import re
+
+# Relative weight of each searchable field; mirrors the content_search text index
+FIELD_WEIGHTS: Dict[str, int] = {"topic": 10, "key_concepts": 5, "body": 1}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have if in into is it its of on or
+that the their then there these this to was were will with what when which who
+""".split())
+
+def _stem(token: str) -> str:
+    """Light suffix stripping so 'matrices'/'matrix' style variants mostly meet."""
+    for suffix, min_length in (("ies", 5), ("ing", 6), ("es", 5), ("ed", 5), ("s", 4)):
+        if token.endswith(suffix) and len(token) >= min_length:
+            if suffix == "ies":
+                return token[:-3] + "y"
+            if suffix == "s" and token.endswith("ss"):
+                return token
+            return token[:-len(suffix)]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on word characters, drop stopwords and stem."""
+    if not text:
+        return []
+    return [
+        _stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+def make_snippet(body: str, query: str, width: int = 160) -> str:
+    """
+    Extract about width characters of body around the first query term match.
+
+    Falls back to the start of body when only the topic or key concepts matched.
+    """
+    if not body:
+        return ""
+
+    lowered = body.lower()
+    position = -1
+    for token in _TOKEN_RE.findall(query.lower()):
+        if token in STOPWORDS:
+            continue
+        match = re.search(r"\b" + re.escape(_stem(token)), lowered)
+        if match and (position < 0 or match.start() < position):
+            position = match.start()
+
+    if position < 0:
+        position = 0
+    start = max(0, position - width // 3)
+    end = min(len(body), start + width)
+
+    # Trim to word boundaries
+    if start > 0:
+        space = body.find(" ", start)
+        if 0 <= space < position:
+            start = space + 1
+    if end < len(body):
+        space = body.rfind(" ", position, end)
+        if space > position:
+            end = space
+
+    snippet = " ".join(body[start:end].split())
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(body) else "")
+
+class InvertedIndex:
+    """
+    In-memory weighted inverted index, the fallback when Mongo text search is unavailable.
+
+    Documents are scored with field-weighted TF-IDF: a term in the topic
+    counts for more than the same term in the body. Queries match any term,
+    like a Mongo $text search without phrases or negations.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._docs: Dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: str, fields: Dict[str, str], stored: dict) -> None:
+        """Index doc_id's searchable fields, replacing any previous version."""
+        self.remove(doc_id)
+
+        weighted: Dict[str, float] = {}
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1)
+            for term in tokenize(text):
+                weighted[term] = weighted.get(term, 0.0) + weight
+
+        for term, frequency in weighted.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._doc_terms[doc_id] = set(weighted)
+        self._docs[doc_id] = stored
+
+    def remove(self, doc_id: str) -> None:
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._docs.pop(doc_id, None)
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        return self._docs.get(doc_id)
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """Return (doc_id, score) for every matching document, best first."""
+        total = len(self._docs)
+        if not total:
+            return []
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for doc_id, frequency in postings.items():
+                # Dampen repeated terms so long bodies do not drown out topic hits
+                scores[doc_id] = scores.get(doc_id, 0.0) + (1 + math.log(frequency)) * idf
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
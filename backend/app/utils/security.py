@@ -3,34 +3,65 @@ from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
+from app.utils.password_hashing import PasswordHasher
+from app.utils.cache import TTLCache
+import calendar
+import hashlib
+import time
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes with another cost are flagged for rehash on login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+# Async hashing on a bounded worker pool; use this from request handlers
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue
+)
 
-def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+def to_timestamp(moment: datetime) -> float:
+    """Epoch seconds of a naive UTC datetime, truncated to milliseconds like MongoDB dates."""
+    return calendar.timegm(moment.utctimetuple()) + moment.microsecond // 1000 / 1000
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expires_minutes)
+        expire = issued_at + timedelta(minutes=settings.jwt_expires_minutes)
     
-    to_encode.update({"exp": expire})
+    # iat lets revocations reject tokens issued before a cut-off; kept to the
+    # millisecond so a token issued right after a revocation is not caught by it
+    to_encode.update({"exp": expire, "iat": to_timestamp(issued_at)})
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
+# Decoded payloads of recently verified tokens, keyed by the token's SHA-256 digest
+token_cache: TTLCache[dict] = TTLCache(settings.jwt_cache_max_size, settings.jwt_cache_ttl_seconds)
+
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode a JWT token."""
+    """
+    Verify and decode a JWT token.
+
+    Successfully verified payloads are cached until JWT_CACHE_EXPIRY_MARGIN_SECONDS
+    before the token's exp (at most JWT_CACHE_TTL_SECONDS), so a client
+    repeating the same token skips the signature check. Failures are not cached.
+    """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
     except JWTError:
         return None
+
+    expires_at = payload.get("exp")
+    ttl = None
+    if isinstance(expires_at, (int, float)):
+        ttl = expires_at - time.time() - settings.jwt_cache_expiry_margin_seconds
+    token_cache.set(cache_key, payload, ttl_seconds=ttl)
+    return dict(payload)
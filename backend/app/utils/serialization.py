@@ -0,0 +1,95 @@
+from typing import Any, Dict, Type, TypeVar
+from datetime import datetime
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from bson import ObjectId
+from app.config import settings
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Per-model map of accepted input keys (field names and aliases) -> field name
+_FIELD_KEYS: Dict[type, Dict[str, str]] = {}
+
+def _field_keys(model_cls: type) -> Dict[str, str]:
+    keys = _FIELD_KEYS.get(model_cls)
+    if keys is None:
+        keys = {}
+        for name, field in model_cls.model_fields.items():
+            keys[name] = name
+            if field.alias:
+                keys[field.alias] = name
+        _FIELD_KEYS[model_cls] = keys
+    return keys
+
+def construct_trusted(model_cls: Type[ModelT], data: dict) -> ModelT:
+    """
+    Build a model from a document we wrote ourselves, skipping validation.
+
+    Only for data from our own collections: values are assumed to already
+    have the declared types. Keys the model does not declare (e.g.
+    hashed_password, content_length) are dropped so they cannot leak onto
+    the instance; missing optional fields get their defaults.
+    """
+    keys = _field_keys(model_cls)
+    values = {key: value for key, value in data.items() if key in keys}
+    return model_cls.model_construct(**values)
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def to_jsonable(content: Any) -> Any:
+    """Dump models (or lists of models) to plain dicts using their _id aliases."""
+    if isinstance(content, BaseModel):
+        return content.model_dump(by_alias=True)
+    if isinstance(content, list):
+        return [to_jsonable(item) for item in content]
+    return content
+
+def fast_response(content: Any, status_code: int = 200) -> Any:
+    """
+    Wrap trusted route output in a FastJSONResponse when FAST_SERIALIZATION is on.
+
+    With the setting off the content is returned unchanged and FastAPI
+    validates and serializes it against response_model as usual.
+    """
+    if not settings.fast_serialization:
+        return content
+    return FastJSONResponse(content=content, status_code=status_code)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that skips FastAPI's response_model validation pass.
+
+    Returning a Response instance makes FastAPI bypass response_model, so
+    only use it for data that was already shaped by our own models.
+
+    It is also the app's default_response_class: for ordinary routes
+    FastAPI still validates against response_model and only the final
+    encoding moves from json.dumps to orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(to_jsonable(content))
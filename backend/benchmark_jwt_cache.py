@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark JWT verification with and without the decoded-token cache
+Runs without a database connection
+
+Uncached: every request runs jwt.decode (signature check and claim checks).
+Cached: verify_token looks the token up by its SHA-256 digest and only
+decodes on a miss. Each case replays a stream of requests from a number of
+active sessions, each session sending its own token repeatedly.
+"""
+
+import sys
+import os
+import random
+import time
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from jose import jwt
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils import security
+
+def make_tokens(count: int):
+    return [
+        security.create_access_token({
+            "sub": f"{i:024x}",
+            "email": f"user{i}@example.com",
+            "first_name": "Test",
+            "last_name": f"User {i}"
+        })
+        for i in range(count)
+    ]
+
+def uncached(token: str) -> dict:
+    return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+
+def bench(label: str, verify, requests) -> float:
+    start = time.perf_counter()
+    for token in requests:
+        assert verify(token) is not None
+    elapsed = time.perf_counter() - start
+    rate = len(requests) / elapsed
+    print(f"   {label:<10} {elapsed * 1e6 / len(requests):8.2f} µs per request  {rate:>10,.0f} req/s")
+    return rate
+
+def run_case(title: str, sessions: int, requests_count: int, cache_size: int) -> None:
+    print(f"\n📊 {title} ({sessions} sessions, {requests_count} requests, cache size {cache_size})")
+    tokens = make_tokens(sessions)
+    rng = random.Random(42)
+    requests = [rng.choice(tokens) for _ in range(requests_count)]
+
+    security.token_cache = TTLCache(cache_size, settings.jwt_cache_ttl_seconds)
+    # Both paths must agree on the payload
+    assert security.verify_token(tokens[0]) == uncached(tokens[0])
+
+    uncached_rate = bench("uncached", uncached, requests)
+    cached_rate = bench("cached", security.verify_token, requests)
+    stats = security.token_cache.get_stats()
+    print(f"   ⚡ {cached_rate / uncached_rate:.1f}x throughput, hit rate {stats['hit_rate']:.1%}, evictions {stats['evictions']}")
+
+def main():
+    print("🚀 JWT verification cache benchmark")
+    print(f"   algorithm: {settings.jwt_algorithm}")
+
+    run_case("Dashboard polling", 50, 50000, 10000)
+    run_case("Many active sessions", 5000, 50000, 10000)
+    run_case("Sessions exceed cache size", 5000, 50000, 1000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization and compression for content responses
+Runs without a database connection
+
+Serialization: the same ContentGenerationResponse payload encoded by
+JSONResponse (json.dumps) and by FastJSONResponse (orjson), the app's
+default response class. Compression: the encoded body run through the
+compressor CompressionMiddleware uses, for gzip levels and (if the brotli
+package is installed) brotli qualities, reporting the CPU cost per response
+and the bytes saved on the wire.
+"""
+
+import sys
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.models.content import ContentGenerationResponse
+from app.utils.serialization import FastJSONResponse, ORJSON_AVAILABLE
+from app.utils.response_compression import BROTLI_AVAILABLE, _Compressor
+
+WORDS = (
+    "vector matrix eigenvalue basis span linear transformation determinant rank "
+    "kernel subspace orthogonal projection inner product norm dimension scalar "
+    "the a of to and is in that for we can this each with as by are be when"
+).split()
+
+def make_markdown(rng: random.Random, size: int) -> str:
+    """Tutorial-shaped Markdown: headings, prose, bullet lists and code blocks."""
+    parts = []
+    section = 0
+    while sum(len(part) for part in parts) < size:
+        section += 1
+        parts.append(f"## {section}. {rng.choice(WORDS).title()} {rng.choice(WORDS).title()}\n\n")
+        for _ in range(rng.randint(2, 4)):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+            parts.append(sentence.capitalize() + ". ")
+        parts.append("\n\n")
+        parts.extend(f"- {' '.join(rng.choice(WORDS) for _ in range(6))}\n" for _ in range(rng.randint(2, 5)))
+        if section % 3 == 0:
+            parts.append(f"\n```python\nimport numpy as np\nA = np.array([[{rng.randint(1, 9)}, {rng.randint(1, 9)}], [{rng.randint(1, 9)}, {rng.randint(1, 9)}]])\nprint(np.linalg.eig(A))\n```\n")
+        parts.append("\n")
+    return "".join(parts)[:size]
+
+def make_responses(count: int, content_size: int) -> List[ContentGenerationResponse]:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    return [
+        ContentGenerationResponse.from_mongo({
+            "_id": ObjectId(),
+            "user_id": str(ObjectId()),
+            "topic": f"Linear Algebra part {i}",
+            "difficulty_level": "intermediate",
+            "content_type": "tutorial",
+            "status": "completed",
+            "generated_content": make_markdown(rng, content_size),
+            "request_timestamp": now - timedelta(minutes=i),
+            "completion_timestamp": now - timedelta(minutes=i) + timedelta(seconds=30),
+            "error_message": None,
+            "partial": False,
+            "metadata": {"agent_used": "ContentGeneratorAgent", "artifacts": ["key_concepts", "study_materials"], "missing_stages": []},
+        }, trusted=True)
+        for i in range(count)
+    ]
+
+def timed(func, rounds: int) -> float:
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+def compress(body: bytes, encoding: str, gzip_level: int = 4, brotli_quality: int = 4) -> bytes:
+    compressor = _Compressor(encoding, gzip_level, brotli_quality)
+    return compressor.compress(body, flush=False) + compressor.finish()
+
+def run_case(title: str, count: int, content_size: int, rounds: int) -> None:
+    print(f"\n📊 {title} ({count} items, {content_size} chars each)")
+    responses = make_responses(count, content_size)
+    payload = responses if count > 1 else responses[0]
+    # What FastAPI hands the response class after response_model validation
+    encoded = jsonable_encoder(payload)
+
+    stdlib_ms = timed(lambda: JSONResponse(content=encoded).body, rounds)
+    orjson_ms = timed(lambda: FastJSONResponse(content=encoded).body, rounds)
+    body = FastJSONResponse(content=encoded).body
+    print(f"   serialize  json.dumps {stdlib_ms:8.3f} ms   orjson {orjson_ms:8.3f} ms   ⚡ {stdlib_ms / orjson_ms:.1f}x")
+
+    codecs = [("gzip", level, None) for level in (1, 4, 6, 9)]
+    if BROTLI_AVAILABLE:
+        codecs += [("br", None, quality) for quality in (4, 11)]
+    print(f"   {'codec':<10} {'bytes':>10} {'ratio':>7} {'ms':>9} {'MB/s':>8}")
+    print(f"   {'identity':<10} {len(body):>10,} {1.0:>7.2f} {0.0:>9.3f} {'-':>8}")
+    for encoding, level, quality in codecs:
+        label = f"{encoding}-{level if encoding == 'gzip' else quality}"
+        compress_ms = timed(lambda: compress(body, encoding, level or 4, quality or 4), max(1, rounds // 10 if quality == 11 else rounds))
+        size = len(compress(body, encoding, level or 4, quality or 4))
+        throughput = len(body) / 1e6 / (compress_ms / 1000)
+        print(f"   {label:<10} {size:>10,} {len(body) / size:>7.2f} {compress_ms:>9.3f} {throughput:>8.0f}")
+
+def main():
+    print("🚀 Response serialization and compression benchmark")
+    print(f"   orjson available: {ORJSON_AVAILABLE}, brotli available: {BROTLI_AVAILABLE}")
+
+    run_case("GET /content/{content_id}", 1, 5000, 500)
+    run_case("GET /content/{content_id} (large content)", 1, 50000, 200)
+    run_case("GET /content/history", 20, 5000, 100)
+
+if __name__ == "__main__":
+    main()
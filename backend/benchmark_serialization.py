@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the validated and trusted serialization paths for content responses
+Runs without a database connection
+
+Validated path: from_mongo validates the document, then FastAPI dumps it,
+validates it again against response_model and encodes it with json.dumps.
+Trusted path: from_mongo(trusted=True) uses model_construct and the response
+is serialized once with orjson (FastJSONResponse).
+"""
+
+import sys
+import os
+import json
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models.content import ContentGenerationResponse, ContentSummary
+from app.utils.serialization import FastJSONResponse, ORJSON_AVAILABLE
+
+def make_documents(count: int, content_size: int) -> List[dict]:
+    """Build content_generations documents shaped like the ones we store."""
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": str(ObjectId()),
+            "topic": f"Linear Algebra part {i}",
+            "difficulty_level": "intermediate",
+            "content_type": "tutorial",
+            "status": "completed",
+            "generated_content": ("Vectors and matrices are the building blocks. " * (content_size // 48 + 1))[:content_size],
+            "request_timestamp": now - timedelta(minutes=i),
+            "completion_timestamp": now - timedelta(minutes=i) + timedelta(seconds=30),
+            "error_message": None,
+            "partial": False,
+            "content_length": content_size,
+            "metadata": {"agent_used": "ContentGeneratorAgent", "artifacts": ["key_concepts", "study_materials"], "missing_stages": []},
+        }
+        for i in range(count)
+    ]
+
+def validated_path(docs: List[dict], model, field, loop) -> bytes:
+    items = [model.from_mongo(dict(doc)) for doc in docs]
+    # What FastAPI does with response_model: dump, validate again, encode with json.dumps
+    content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+    return JSONResponse(content=content).body
+
+def trusted_path(docs: List[dict], model) -> bytes:
+    items = [model.from_mongo(dict(doc), trusted=True) for doc in docs]
+    return FastJSONResponse(content=items).body
+
+def bench(label: str, func, rounds: int) -> float:
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+    print(f"   {label:<10} {elapsed_ms:8.3f} ms per response")
+    return elapsed_ms
+
+def run_case(title: str, model, count: int, content_size: int, rounds: int) -> None:
+    print(f"\n📊 {title} ({count} items, {content_size} chars each)")
+    docs = make_documents(count, content_size)
+    field = create_response_field(name="response", type_=List[model])
+    loop = asyncio.new_event_loop()
+
+    # Both paths must produce the same payload
+    assert json.loads(validated_path(docs, model, field, loop)) == json.loads(trusted_path(docs, model))
+
+    validated_ms = bench("validated", lambda: validated_path(docs, model, field, loop), rounds)
+    trusted_ms = bench("trusted", lambda: trusted_path(docs, model), rounds)
+    print(f"   ⚡ {validated_ms / trusted_ms:.1f}x faster")
+    loop.close()
+
+def main():
+    print("🚀 Serialization benchmark")
+    print(f"   orjson available: {ORJSON_AVAILABLE}")
+
+    run_case("GET /content/history?summary=true", ContentSummary, 20, 0, 500)
+    run_case("GET /content/history", ContentGenerationResponse, 20, 5000, 300)
+    run_case("GET /content/history (large content)", ContentGenerationResponse, 20, 50000, 100)
+    run_case("GET /content/{content_id}", ContentGenerationResponse, 1, 50000, 2000)
+
+if __name__ == "__main__":
+    main()
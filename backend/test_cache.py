@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the in-process TTL/LRU cache
+Runs without a database connection
+"""
+
+import sys
+import os
+import time
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+def test_lru_and_ttl():
+    """Test hits, LRU eviction, expiry and invalidation."""
+    from app.utils.cache import TTLCache
+
+    print("1. Testing hits and misses...")
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    print("   ✅ Stored values are returned")
+
+    print("2. Testing least recently used entry is evicted...")
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    print("   ✅ 'b' evicted, 'a' kept because it was read")
+
+    print("3. Testing expiry...")
+    cache.set("d", 4, ttl_seconds=0.05)
+    time.sleep(0.06)
+    assert cache.get("d") is None
+    print("   ✅ Entry expired after its TTL")
+
+    print("4. Testing invalidation and stats...")
+    assert cache.invalidate("c") is True
+    assert cache.invalidate("c") is False
+    assert cache.get("c") is None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 2 and stats["expirations"] == 1 and stats["invalidations"] == 1
+    assert stats["hits"] == 4 and stats["misses"] == 4 and stats["hit_rate"] == 0.5
+    print(f"   ✅ {stats}")
+
+def test_disabled():
+    """Test a zero TTL turns the cache off."""
+    from app.utils.cache import TTLCache
+
+    print("5. Testing TTL 0 disables caching...")
+    cache = TTLCache(max_size=10, ttl_seconds=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+    print("   ✅ Nothing is stored")
+
+if __name__ == "__main__":
+    print("🚀 Testing TTL cache")
+    test_lru_and_ttl()
+    test_disabled()
+    print("🎉 TTL cache tests completed!")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script to verify at-rest compression of generated content
+Runs without a database connection
+"""
+
+import sys
+import os
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+def test_content_compression():
+    """Test compress_text / decompress_text round trips and legacy passthrough."""
+    from bson.binary import Binary
+    from app.utils.compression import compress_text, decompress_text, ZLIB_SUBTYPE
+    
+    print("1. Testing large content is compressed...")
+    tutorial = "## Linear Algebra\n\nVectors and matrices are the building blocks. " * 500
+    stored = compress_text(tutorial, threshold=4096)
+    assert isinstance(stored, Binary), "large content should be stored as Binary"
+    assert stored.subtype == ZLIB_SUBTYPE or stored.subtype == 0x81
+    print(f"   ✅ {len(tutorial.encode('utf-8'))} bytes stored as {len(stored)} bytes")
+    
+    print("2. Testing round trip...")
+    assert decompress_text(stored) == tutorial
+    print("   ✅ Decompressed content matches original")
+    
+    print("3. Testing small content stays a plain string...")
+    assert compress_text("Short summary", threshold=4096) == "Short summary"
+    print("   ✅ Small content left uncompressed")
+    
+    print("4. Testing legacy uncompressed documents...")
+    assert decompress_text("Legacy plain content") == "Legacy plain content"
+    assert decompress_text(None) is None
+    print("   ✅ Legacy values pass through unchanged")
+    
+    print("5. Testing compression can be disabled...")
+    assert compress_text(tutorial, threshold=0) == tutorial
+    print("   ✅ Threshold 0 disables compression")
+
+if __name__ == "__main__":
+    print("🧪 Testing Content Compression")
+    print("=" * 50)
+    
+    try:
+        test_content_compression()
+        print("\n🎉 All compression tests passed!")
+    except AssertionError as e:
+        print(f"\n💥 Compression test failed: {str(e)}")
+        sys.exit(1)
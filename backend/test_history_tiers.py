@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script to verify history pages merge the hot and archived tiers
+Runs without a database connection (fake in-memory collections)
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from bson import ObjectId
+from app.utils.database import Database
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(doc) for doc in self.docs]
+
+class FakeCollection:
+    """Answers the user_id + keyset queries history pages send."""
+
+    def __init__(self):
+        self.docs = []
+
+    def with_options(self, **kwargs):
+        return self
+
+    def _matches(self, doc, query):
+        if doc["user_id"] != query["user_id"]:
+            return False
+        if "$or" not in query:
+            return True
+        older, same_time = query["$or"]
+        return (doc["request_timestamp"] < older["request_timestamp"]["$lt"]
+                or (doc["request_timestamp"] == same_time["request_timestamp"] and doc["_id"] < same_time["_id"]["$lt"]))
+
+    def find(self, query, projection=None):
+        return FakeCursor([doc for doc in self.docs if self._matches(doc, query)])
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+def make_doc(topic, timestamp, status):
+    return {
+        "_id": ObjectId(), "user_id": "u1", "topic": topic, "difficulty_level": "beginner",
+        "content_type": "tutorial", "status": status, "request_timestamp": timestamp, "content_length": 0
+    }
+
+def test_stale_hot_docs_do_not_hide_archive():
+    """Test a full page of old hot documents still merges in newer archived ones."""
+    from app.services.content_service import ContentService
+    from app.services.archive_service import ARCHIVE_COLLECTION
+
+    async def run():
+        now = datetime.utcnow()
+        original_client, original_db = Database.client, Database.db
+        Database.db = FakeDatabase()
+        try:
+            # A request left pending for a week stays hot; newer finished ones were archived
+            Database.db["content_generations"].docs = [
+                make_doc("Stale pending", now - timedelta(days=7), "pending"),
+                make_doc("Stale processing", now - timedelta(days=6), "processing"),
+                make_doc("Stale retry", now - timedelta(days=5), "pending"),
+            ]
+            Database.db[ARCHIVE_COLLECTION].docs = [
+                make_doc(f"Archived {i}", now - timedelta(hours=i), "completed") for i in range(3)
+            ]
+            service = ContentService(stats_service=object())
+
+            print("1. Testing the first page is the newest across both tiers...")
+            page, cursor = await service.get_user_content_page("u1", limit=2)
+            assert [item.topic for item in page] == ["Archived 0", "Archived 1"]
+            print("   ✅ Newer archived documents are not hidden by a full hot page")
+
+            print("2. Testing paging visits every document once, in order...")
+            topics = [item.topic for item in page]
+            while cursor is not None:
+                page, cursor = await service.get_user_content_page("u1", limit=2, cursor=cursor)
+                topics.extend(item.topic for item in page)
+            assert topics == ["Archived 0", "Archived 1", "Archived 2", "Stale retry", "Stale processing", "Stale pending"]
+            print("   ✅ Cursor never skips past archived documents")
+
+            print("3. Testing the full history list merges the tiers too...")
+            history = await service.get_user_content_history("u1", limit=3)
+            assert [item.topic for item in history] == ["Archived 0", "Archived 1", "Archived 2"]
+            print("   ✅ History list ordered across tiers")
+        finally:
+            Database.client, Database.db = original_client, original_db
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    print("🚀 Testing history tier merging")
+    test_stale_hot_docs_do_not_hide_archive()
+    print("🎉 History tier tests completed!")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script to verify generation job cancellation and long-poll waiters
+Runs without a database connection (fake content service)
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+CONTENT_ID = "65f000000000000000000001"
+
+def test_waiters():
+    """Test waiters are woken on completion, time out and are cleaned up."""
+    from app.services.job_manager import JobManager
+
+    async def run():
+        manager = JobManager(max_concurrent_jobs=2)
+
+        print("1. Testing a waiter is woken when the content completes...")
+        waiter = manager.register_waiter("c1")
+        asyncio.get_running_loop().call_later(0.05, manager.notify_completion, "c1", "completed")
+        assert await manager.wait(waiter, timeout=5) == "completed"
+        manager.discard_waiter("c1", waiter)
+        assert manager.get_stats()["waiting_requests"] == 0
+        print("   ✅ Waiter resolved with the terminal status")
+
+        print("2. Testing a timeout returns None and the waiter is cleaned up...")
+        waiter = manager.register_waiter("c2")
+        assert manager.get_stats()["watched_content"] == 1
+        assert await manager.wait(waiter, timeout=0.05) is None
+        manager.discard_waiter("c2", waiter)
+        assert waiter.cancelled()
+        stats = manager.get_stats()
+        assert stats["waiting_requests"] == 0 and stats["watched_content"] == 0
+        manager.notify_completion("c2", "completed")
+        print("   ✅ Timed-out waiter removed; a later completion finds nobody waiting")
+
+        print("3. Testing cancel() stops a running job and frees its slot...")
+        started = asyncio.Event()
+
+        async def job():
+            started.set()
+            await asyncio.sleep(60)
+        task = manager.submit("c3", job)
+        await started.wait()
+        assert manager.is_active("c3") and manager.get_stats()["running_jobs"] == 1
+        assert manager.cancel("c3")
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled() and not manager.is_active("c3")
+        assert manager.get_stats()["running_jobs"] == 0
+        assert not manager.cancel("c3")
+        print("   ✅ Job cancelled; a second cancel() is a no-op")
+
+    asyncio.run(run())
+
+def make_content(status):
+    from app.models.content import ContentGenerationResponse
+    return ContentGenerationResponse(
+        _id=CONTENT_ID, user_id="u1", topic="Vectors", difficulty_level="beginner",
+        content_type="tutorial", status=status, request_timestamp=datetime(2024, 1, 1)
+    )
+
+class FakeContentService:
+    """Content state for the wait and cancel routes; can finish the job shortly after the first read."""
+
+    def __init__(self, status, complete_after=None):
+        self.status = status
+        self.complete_after = complete_after
+
+    async def get_content_by_id(self, content_id):
+        from app.services.job_manager import job_manager
+        content = make_content(self.status)
+        if self.complete_after is not None:
+            def complete():
+                self.status = "completed"
+                job_manager.notify_completion(content_id, "completed")
+            asyncio.get_running_loop().call_later(self.complete_after, complete)
+            self.complete_after = None
+        return content
+
+    async def get_content_access_info(self, content_id):
+        return {"user_id": "u1", "status": self.status}
+
+    async def mark_content_cancelled(self, content_id):
+        self.status = "cancelled"
+        return make_content("cancelled")
+
+def make_client(content_service):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.models.user import Principal
+    from app.routes.content import router
+    from app.routes.auth import get_current_principal
+    from app.dependencies import get_content_service
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_content_service] = lambda: content_service
+    app.dependency_overrides[get_current_principal] = lambda: Principal(id="u1")
+    return TestClient(app)
+
+def test_routes():
+    """Test the long-poll and cancel routes against the shared job manager."""
+    from app.services.job_manager import job_manager
+
+    print("4. Testing the wait route returns the current status on timeout...")
+    with make_client(FakeContentService("processing")) as client:
+        response = client.get(f"/content/{CONTENT_ID}/wait?timeout=0.05")
+        assert response.status_code == 200 and response.json()["status"] == "processing"
+    assert job_manager.get_stats()["waiting_requests"] == 0
+    print("   ✅ processing returned after the timeout, waiter discarded")
+
+    print("5. Testing the wait route returns as soon as the job completes...")
+    with make_client(FakeContentService("processing", complete_after=0.05)) as client:
+        response = client.get(f"/content/{CONTENT_ID}/wait?timeout=10")
+        assert response.status_code == 200 and response.json()["status"] == "completed"
+        assert response.elapsed.total_seconds() < 5
+    assert job_manager.get_stats()["waiting_requests"] == 0
+    print("   ✅ Woken by the completion instead of waiting out the timeout")
+
+    print("6. Testing the cancel route stops the running job...")
+    content_service = FakeContentService("processing")
+    with make_client(content_service) as client:
+        async def start_job():
+            started = asyncio.Event()
+
+            async def job():
+                started.set()
+                await asyncio.sleep(60)
+            task = job_manager.submit(CONTENT_ID, job)
+            await started.wait()
+            return task
+        task = client.portal.call(start_job)
+
+        response = client.post(f"/content/{CONTENT_ID}/cancel")
+        assert response.status_code == 200 and response.json()["status"] == "cancelled"
+        client.portal.call(asyncio.sleep, 0.01)
+        assert task.cancelled() and not job_manager.is_active(CONTENT_ID)
+
+        response = client.post(f"/content/{CONTENT_ID}/cancel")
+        assert response.status_code == 409
+    print("   ✅ Job cancelled and status written; cancelling again is a conflict")
+
+if __name__ == "__main__":
+    print("🚀 Testing job manager")
+    test_waiters()
+    test_routes()
+    print("🎉 Job manager tests completed!")
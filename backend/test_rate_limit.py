@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the sliding-window login limiter
+Runs without a database connection (in-memory backend)
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+def test_window_rollover():
+    """Test the memory backend shifts the current window into the previous one."""
+    from app.utils.rate_limit import MemoryRateLimitBackend
+
+    async def run():
+        backend = MemoryRateLimitBackend()
+        print("1. Testing counts within one window...")
+        assert await backend.increment("k", 60, 0) == (0, 1)
+        assert await backend.increment("k", 60, 59) == (0, 2)
+        print("   ✅ Hits accumulate in the current window")
+
+        print("2. Testing rollover into the next window...")
+        assert await backend.increment("k", 60, 61) == (2, 1)
+        print("   ✅ Previous window count carried over")
+
+        print("3. Testing a gap of more than one window resets...")
+        assert await backend.increment("k", 60, 200) == (0, 1)
+        await backend.reset("k")
+        assert await backend.increment("k", 60, 201) == (0, 1)
+        print("   ✅ Stale and reset keys start from zero")
+
+    asyncio.run(run())
+
+def test_limiter():
+    """Test the limiter allows up to the limit, rejects with a retry hint and resets."""
+    from app.utils.rate_limit import MemoryRateLimitBackend, SlidingWindowLimiter
+
+    async def run():
+        limiter = SlidingWindowLimiter("login_email", 3, 60, MemoryRateLimitBackend())
+        print("4. Testing the limit is enforced...")
+        results = [await limiter.hit("user@example.com") for _ in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert 1 <= results[-1][1] <= 60
+        print(f"   ✅ Fourth attempt rejected, retry after {results[-1][1]:.0f}s")
+
+        print("5. Testing keys are independent and reset clears a key...")
+        assert (await limiter.hit("other@example.com"))[0]
+        await limiter.reset("user@example.com")
+        assert (await limiter.hit("user@example.com"))[0]
+        assert limiter.get_stats()["rejected"] == 1
+        print("   ✅ Other keys unaffected; reset key allowed again")
+
+        print("6. Testing a limit of 0 disables the limiter...")
+        disabled = SlidingWindowLimiter("login_ip", 0, 60, MemoryRateLimitBackend())
+        assert all([(await disabled.hit("1.2.3.4"))[0] for _ in range(10)])
+        print("   ✅ Always allowed")
+
+    asyncio.run(run())
+
+def test_registration_shares_ip_limit():
+    """Test registrations and logins from one IP draw on the same budget."""
+    from app.utils.rate_limit import MemoryRateLimitBackend
+    from app.services.login_throttle import LoginThrottle
+
+    async def run():
+        throttle = LoginThrottle(MemoryRateLimitBackend())
+        throttle.by_ip.limit = 3
+        print("7. Testing registrations count against the per-IP limit...")
+        assert await throttle.check_registration("1.2.3.4") is None
+        assert await throttle.check_registration("1.2.3.4") is None
+        assert await throttle.check("user@example.com", "1.2.3.4") is None
+        assert await throttle.check_registration("1.2.3.4") is not None
+        assert await throttle.check_registration(None) is None
+        print("   ✅ Fourth attempt from the IP rejected")
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    print("🚀 Testing login rate limiter")
+    test_window_rollover()
+    test_limiter()
+    test_registration_shares_ip_limit()
+    print("🎉 Rate limiter tests completed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify per-operation read routing
+Runs against a replica-set stand-in client that never connects; set
+MONGODB_REPLSET_URI (e.g. a local `mongod --replSet rs0`) to also run the
+routed reads against a real replica set
+"""
+
+import sys
+import os
+import asyncio
+from contextlib import contextmanager
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from app.config import settings
+from app.utils.database import Database
+from app.utils.read_routing import get_read_preference, DEFAULT_READ_ROUTES
+
+REPLSET_STANDIN_URI = "mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0"
+
+@contextmanager
+def use_client(uri: str, connect: bool):
+    """Point Database at a test client, restoring the previous client and db afterwards."""
+    original_client, original_db = Database.client, Database.db
+    Database.client = AsyncIOMotorClient(uri, connect=connect, serverSelectionTimeoutMS=2000)
+    Database.db = Database.client["tutormind_read_routing_test"]
+    try:
+        yield
+    finally:
+        Database.client.close()
+        Database.client, Database.db = original_client, original_db
+
+def test_read_preference_resolution():
+    """Test that operations resolve to the routed read preference."""
+    print("1. Testing history reads go to secondaries...")
+    preference = get_read_preference("content.history")
+    assert isinstance(preference, SecondaryPreferred)
+    assert preference.max_staleness == settings.mongodb_max_staleness_seconds
+    print(f"   ✅ content.history -> {preference.mongos_mode} (maxStalenessSeconds={preference.max_staleness})")
+
+    print("2. Testing ownership checks stay on the primary...")
+    assert isinstance(get_read_preference("content.access_check"), Primary)
+    print("   ✅ content.access_check -> primary")
+
+    print("3. Testing unknown operations default to the primary...")
+    assert isinstance(get_read_preference("content.something_new"), Primary)
+    print("   ✅ Unknown operation -> primary")
+
+    print("4. Testing settings override the defaults...")
+    original = settings.mongodb_read_routes
+    try:
+        settings.mongodb_read_routes = {"content.history": "primary", "content.by_id": "nearest"}
+        assert isinstance(get_read_preference("content.history"), Primary)
+        assert get_read_preference("content.by_id").mongos_mode == "nearest"
+        settings.mongodb_read_routes = {"content.history": "fastest"}
+        assert isinstance(get_read_preference("content.history"), Primary)
+    finally:
+        settings.mongodb_read_routes = original
+    print("   ✅ MONGODB_READ_ROUTES overrides apply; invalid modes fall back to primary")
+
+def test_service_collections_are_routed():
+    """Test that ContentService reads use the routed collection handles."""
+    from app.services.content_service import ContentService
+
+    print("5. Testing ContentService read handles on a replica-set stand-in...")
+    with use_client(REPLSET_STANDIN_URI, connect=False):
+        service = ContentService()
+
+        for operation, mode in DEFAULT_READ_ROUTES.items():
+            preference = service._reader(operation).read_preference
+            assert preference.mongos_mode == mode, f"{operation}: {preference.mongos_mode} != {mode}"
+            print(f"   ✅ {operation} -> {preference.mongos_mode}")
+
+        # Writes keep using the primary-bound handle
+        assert isinstance(service.collection.read_preference, Primary)
+        print("   ✅ Write-path collection stays on the primary")
+
+async def run_live_replica_set_reads(uri: str):
+    """Run routed reads against a real replica set."""
+    from app.services.content_service import ContentService
+
+    print("6. Testing routed reads against a live replica set...")
+    with use_client(uri, connect=True):
+        service = ContentService()
+        history = await service.get_user_content_history("read-routing-test-user", limit=5)
+        page, _ = await service.get_user_content_page("read-routing-test-user", limit=5)
+        print(f"   ✅ History read returned {len(history)} items, page read returned {len(page)} items")
+
+def main():
+    print("🚀 Testing read routing")
+    test_read_preference_resolution()
+    test_service_collections_are_routed()
+
+    replset_uri = os.getenv("MONGODB_REPLSET_URI")
+    if replset_uri:
+        asyncio.run(run_live_replica_set_reads(replset_uri))
+    else:
+        print("6. ⏭️ Set MONGODB_REPLSET_URI to run reads against a live replica set")
+
+    print("🎉 Read routing tests completed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify negotiated response compression
+Runs without a database connection (small standalone app)
+"""
+
+import sys
+import os
+import gzip
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+def make_client():
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import Response, StreamingResponse
+    from fastapi.testclient import TestClient
+    from app.utils.serialization import FastJSONResponse
+    from app.utils.response_compression import CompressionMiddleware
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    # Same order as app/main.py: CORS runs inside compression
+    app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:5173"], allow_credentials=True)
+    app.add_middleware(CompressionMiddleware, minimum_size=500, brotli_enabled=False)
+
+    @app.get("/large")
+    async def large():
+        return {"generated_content": "Vectors and matrices are the building blocks. " * 100}
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(5):
+                yield f"chunk {i} ".encode() * 50
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+def test_negotiation():
+    """Test Accept-Encoding parsing and codec choice."""
+    from app.utils.response_compression import choose_encoding, parse_accept_encoding
+
+    print("1. Testing Accept-Encoding parsing...")
+    assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    print("   ✅ Codings and q-values parsed")
+
+    print("2. Testing codec choice...")
+    assert choose_encoding("gzip, deflate", brotli_enabled=False) == "gzip"
+    assert choose_encoding("*", brotli_enabled=False) == "gzip"
+    assert choose_encoding("gzip;q=0", brotli_enabled=False) is None
+    assert choose_encoding("deflate", brotli_enabled=False) is None
+    print("   ✅ gzip chosen when accepted, identity otherwise")
+
+def test_middleware():
+    """Test which responses get compressed and that headers stay consistent."""
+    client = make_client()
+
+    print("3. Testing large JSON responses are gzipped...")
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < 4700
+    assert response.json()["generated_content"].startswith("Vectors")
+    print(f"   ✅ {len(response.content)} bytes decoded from {response.headers['content-length']} on the wire")
+
+    print("4. Testing responses that are left alone...")
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+    print("   ✅ Small bodies, images and identity-only clients sent uncompressed")
+
+    print("5. Testing Vary is kept and extended...")
+    response = client.get("/large", headers={"Accept-Encoding": "gzip", "Origin": "http://localhost:5173"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert [value.strip() for value in response.headers["vary"].split(",")] == ["Origin", "Accept-Encoding"]
+    for path, accept in (("/large", "identity"), ("/small", "gzip")):
+        response = client.get(path, headers={"Accept-Encoding": accept, "Origin": "http://localhost:5173"})
+        assert "content-encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["vary"] and "Origin" in response.headers["vary"]
+    assert "vary" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    print("   ✅ Vary: Origin kept; Accept-Encoding added whether or not the body was compressed")
+
+    print("6. Testing streamed responses...")
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(f"chunk {i} " * 50 for i in range(5))
+    print("   ✅ Chunks compressed incrementally and decode to the original body")
+
+    print("7. Testing the raw body is valid gzip...")
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).startswith(b'{"generated_content"')
+    print("   ✅ Body decompresses with the gzip module")
+
+if __name__ == "__main__":
+    print("🚀 Testing response compression")
+    test_negotiation()
+    test_middleware()
+    print("🎉 Response compression tests completed!")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script to verify token revocation cut-offs at sub-second precision
+Runs without a database connection (fake revocations collection)
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.utils.database import Database
+
+class FakeCollection:
+    """Stores the $set fields of upserts like find_one_and_update with ReturnDocument.AFTER."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        revocation_doc = {**self.docs.get(query["_id"], {"_id": query["_id"]}), **update["$set"]}
+        self.docs[query["_id"]] = revocation_doc
+        return dict(revocation_doc)
+
+def test_revocation_boundary():
+    """Test tokens issued in the same second as a revocation are told apart."""
+    from app.services.revocation_service import RevocationService
+    from app.utils.security import create_access_token, to_timestamp, verify_token
+
+    async def run():
+        original_client, original_db = Database.client, Database.db
+        Database.db = {"auth_revocations": FakeCollection()}
+        try:
+            service = RevocationService()
+
+            print("1. Testing the cut-off keeps milliseconds...")
+            revoked_at = datetime(2024, 1, 1, 12, 0, 0, 400000)
+            service._apply({"_id": "u1", "revoked_before": revoked_at})
+            cutoff = to_timestamp(revoked_at)
+            assert service.is_revoked("u1", cutoff - 0.001)
+            assert not service.is_revoked("u1", cutoff)
+            assert not service.is_revoked("u1", cutoff + 0.5)
+            print("   ✅ Earlier in the same second rejected, same millisecond and later accepted")
+
+            print("2. Testing whole-second iat claims from older tokens...")
+            assert service.is_revoked("u1", int(cutoff))
+            assert service.is_revoked("u1", None)
+            print("   ✅ Legacy tokens in the revoked second stay rejected")
+
+            print("3. Testing a token issued right after a revocation is accepted...")
+            old_token = verify_token(create_access_token({"sub": "u2"}))
+            await asyncio.sleep(0.002)
+            await service.revoke_tokens("u2")
+            new_token = verify_token(create_access_token({"sub": "u2"}))
+            assert service.is_revoked("u2", old_token["iat"])
+            assert not service.is_revoked("u2", new_token["iat"])
+            print("   ✅ Token from the revoking request survives; the earlier one does not")
+        finally:
+            Database.client, Database.db = original_client, original_db
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    print("🚀 Testing token revocation")
+    test_revocation_boundary()
+    print("🎉 Revocation tests completed!")
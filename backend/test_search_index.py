@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the in-memory search index fallback and snippets
+Runs without a database connection
+"""
+
+import sys
+import os
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+def build_index():
+    from app.utils.search_index import InvertedIndex
+
+    index = InvertedIndex()
+    index.add("1", {"topic": "Linear Algebra", "key_concepts": "vectors matrices", "body": "Vectors and matrices are the building blocks."}, {"topic": "Linear Algebra"})
+    index.add("2", {"topic": "Photosynthesis", "key_concepts": "chlorophyll", "body": "Plants use light. Thylakoid matrices host the reactions."}, {"topic": "Photosynthesis"})
+    index.add("3", {"topic": "World War II", "key_concepts": "history", "body": "The war lasted from 1939 to 1945."}, {"topic": "World War II"})
+    return index
+
+def test_search_ranking():
+    """Test matching, field-weighted ranking and removal."""
+    index = build_index()
+
+    print("1. Testing any-term matching...")
+    assert [doc_id for doc_id, _ in index.search("chlorophyll war")] in (["2", "3"], ["3", "2"])
+    assert index.search("quantum") == []
+    print("   ✅ Documents matching any query term are returned")
+
+    print("2. Testing topic and key concept matches outrank body matches...")
+    results = index.search("matrices")
+    assert [doc_id for doc_id, _ in results] == ["1", "2"], results
+    print("   ✅ Key concept match ranked above body-only match")
+
+    print("3. Testing stopwords and plural stemming...")
+    assert index.search("the and of") == []
+    assert [doc_id for doc_id, _ in index.search("vector")] == ["1"]
+    print("   ✅ Stopwords ignored, 'vector' matches 'vectors'")
+
+    print("4. Testing re-indexing and removal...")
+    index.add("3", {"topic": "Cold War", "body": "Tension between blocs."}, {"topic": "Cold War"})
+    assert index.search("1939") == []
+    assert index.get("3") == {"topic": "Cold War"}
+    index.remove("1")
+    assert [doc_id for doc_id, _ in index.search("vectors")] == []
+    assert len(index) == 2
+    print("   ✅ Replaced and removed documents leave no stale postings")
+
+def test_snippets():
+    """Test snippet extraction around the first match."""
+    from app.utils.search_index import make_snippet
+
+    body = ("Introduction to the course. " * 20) + "Eigenvalues describe how a matrix scales its eigenvectors. " + ("Closing remarks. " * 20)
+
+    print("5. Testing snippet centres on the match...")
+    snippet = make_snippet(body, "eigenvalues", width=80)
+    assert "Eigenvalues" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert len(snippet) <= 82
+    print(f"   ✅ {snippet}")
+
+    print("6. Testing snippet falls back to the start of the body...")
+    assert make_snippet("Short body.", "topic-only") == "Short body."
+    assert make_snippet("", "anything") == ""
+    print("   ✅ Start of body used when the body has no match")
+
+if __name__ == "__main__":
+    print("🚀 Testing search index")
+    test_search_ranking()
+    test_snippets()
+    print("🎉 Search index tests completed!")